@@ -17,6 +17,8 @@
     and the viscosity at a given temperature, usually at 38 C(100F).
     The criteria follows closely, but not identically, to the ASTM standards
 '''
+from __future__ import print_function
+
 import transaction
 
 import unit_conversion as uc
@@ -26,20 +28,20 @@ from oil_library.utilities import get_viscosity
 
 
 def process_categories(session):
-    print '\nPurging Categories...'
+    print('\nPurging Categories...')
     num_purged = clear_categories(session)
 
-    print '{0} categories purged.'.format(num_purged)
-    print 'Orphaned categories:', session.query(Category).all()
+    print('{0} categories purged.'.format(num_purged))
+    print('Orphaned categories:', session.query(Category).all())
 
-    print 'Loading Categories...'
+    print('Loading Categories...')
     load_categories(session)
-    print 'Finished!!!'
+    print('Finished!!!')
 
-    print 'Here are our newly built categories...'
+    print('Here are our newly built categories...')
     for c in session.query(Category).filter(Category.parent == None):
         for item in list_categories(c):
-            print '   ', item
+            print('   ', item)
 
     link_oils_to_categories(session)
 
@@ -129,8 +131,8 @@ def link_crude_light_oils(session):
         o.categories.append(category)
         count += 1
 
-    print ('{0} oils added to {1} -> {2}.'
-           .format(count, top_category.name, category.name))
+    print('{0} oils added to {1} -> {2}.'
+          .format(count, top_category.name, category.name))
     transaction.commit()
 
 
@@ -149,8 +151,8 @@ def link_crude_medium_oils(session):
         o.categories.append(category)
         count += 1
 
-    print ('{0} oils added to {1} -> {2}.'
-           .format(count, top_category.name, category.name))
+    print('{0} oils added to {1} -> {2}.'
+          .format(count, top_category.name, category.name))
     transaction.commit()
 
 
@@ -168,8 +170,8 @@ def link_crude_heavy_oils(session):
         o.categories.append(category)
         count += 1
 
-    print ('{0} oils added to {1} -> {2}.'
-           .format(count, top_category.name, category.name))
+    print('{0} oils added to {1} -> {2}.'
+          .format(count, top_category.name, category.name))
     transaction.commit()
 
 
@@ -209,9 +211,9 @@ def link_refined_fuel_oil_1(session):
                 o.categories.append(category)
             count += 1
 
-    print ('{0} oils added to {1} -> {2}.'
-           .format(count, top_category.name,
-                   [n.name for n in categories]))
+    print('{0} oils added to {1} -> {2}.'
+          .format(count, top_category.name,
+                  [n.name for n in categories]))
     transaction.commit()
 
 
@@ -251,9 +253,9 @@ def link_refined_fuel_oil_2(session):
                 o.categories.append(category)
             count += 1
 
-    print ('{0} oils added to {1} -> {2}.'
-           .format(count, top_category.name,
-                   [n.name for n in categories]))
+    print('{0} oils added to {1} -> {2}.'
+          .format(count, top_category.name,
+                  [n.name for n in categories]))
     transaction.commit()
 
 
@@ -291,9 +293,9 @@ def link_refined_ifo(session):
                 o.categories.append(category)
             count += 1
 
-    print ('{0} oils added to {1} -> {2}.'
-           .format(count, top_category.name,
-                   [n.name for n in categories]))
+    print('{0} oils added to {1} -> {2}.'
+          .format(count, top_category.name,
+                  [n.name for n in categories]))
     transaction.commit()
 
 
@@ -333,9 +335,9 @@ def link_refined_fuel_oil_6(session):
                 o.categories.append(category)
             count += 1
 
-    print ('{0} oils added to {1} -> {2}.'
-           .format(count, top_category.name,
-                   [n.name for n in categories]))
+    print('{0} oils added to {1} -> {2}.'
+          .format(count, top_category.name,
+                  [n.name for n in categories]))
     transaction.commit()
 
 
@@ -367,8 +369,8 @@ def link_all_other_oils(session):
             o.categories.append(category)
         count += 1
 
-    print ('{0} oils added to {1}.'
-           .format(count, [n.name for n in categories]))
+    print('{0} oils added to {1}.'
+          .format(count, [n.name for n in categories]))
     transaction.commit()
 
 
@@ -384,8 +386,8 @@ def show_uncategorized_oils(session):
              'viscosity\t'
              'pour_point\t'
              'name\n')
-    print ('{0} oils uncategorized.'
-           .format(len(oils)))
+    print('{0} oils uncategorized.'
+          .format(len(oils)))
     for o in oils:
         if o.api >= 0:
             if o.api < 15:
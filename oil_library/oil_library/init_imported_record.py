@@ -4,6 +4,8 @@
     Basically, we take the parsed record from our OilLib flat file, and
     find a place for all the data.
 '''
+from __future__ import print_function
+
 import sys
 
 import transaction
@@ -58,16 +60,29 @@ def purge_oil_records(session):
     return rowcount
 
 
-def add_oil_object(session, file_columns, row_data):
+def add_oil_object(session, file_columns, row_data, synonyms=None):
+    '''
+        Create an ImportedRecord, along with its related objects, from a
+        parsed row of our OilLib file, and add it to our session.
+        Nothing is flushed or committed here, so a batch of records can be
+        inserted together.
+
+        :param synonyms: optional dict of the Synonym objects we know of,
+                         keyed by name.  When loading a lot of records we
+                         look our synonyms up here instead of querying the
+                         session for every one of them.
+
+        :returns: the new ImportedRecord, or None if the row was rejected.
+    '''
     file_columns = [slugify_filename(c).lower()
                     for c in file_columns]
     row_dict = dict(zip(file_columns, row_data))
 
     if rejected(row_dict):
-        print ('### Rejecting record {0} ({1})'
-               .format(row_dict.get('adios_oil_id'),
-                       row_dict.get('oil_name')))
-        return
+        print('### Rejecting record {0} ({1})'
+              .format(row_dict.get('adios_oil_id'),
+                      row_dict.get('oil_name')))
+        return None
 
     fix_pour_point(row_dict)
     fix_flash_point(row_dict)
@@ -75,7 +90,7 @@ def add_oil_object(session, file_columns, row_data):
 
     oil = ImportedRecord(**row_dict)
 
-    add_synonyms(session, oil, row_dict)
+    add_synonyms(session, oil, row_dict, synonyms)
     add_densities(oil, row_dict)
     add_kinematic_viscosities(oil, row_dict)
     add_dynamic_viscosities(oil, row_dict)
@@ -84,7 +99,21 @@ def add_oil_object(session, file_columns, row_data):
     add_toxicity_lethal_concentrations(oil, row_dict)
 
     session.add(oil)
-    transaction.commit()
+
+    return oil
+
+
+def new_imported_objects(records):
+    '''
+        All the objects created for our imported records.
+    '''
+    for rec in records:
+        yield rec
+
+        for related in (rec.synonyms, rec.densities, rec.kvis, rec.dvis,
+                        rec.cuts, rec.toxicities):
+            for obj in related:
+                yield obj
 
 
 def rejected(kwargs):
@@ -128,19 +157,28 @@ def fix_preferred_oils(kwargs):
                                 else False)
 
 
-def add_synonyms(session, oil, row_dict):
+def add_synonyms(session, oil, row_dict, known_synonyms=None):
     if row_dict.get('Synonyms'):
         for s in row_dict.get('Synonyms').split(','):
             s = s.strip()
             if len(s) > 0:
-                synonyms = (session.query(Synonym)
-                            .filter(Synonym.name == s).all())
+                if known_synonyms is not None:
+                    synonyms = ([known_synonyms[s]]
+                                if s in known_synonyms else [])
+                else:
+                    synonyms = (session.query(Synonym)
+                                .filter(Synonym.name == s).all())
+
                 if len(synonyms) > 0:
                     # we link the existing synonym object
                     oil.synonyms.append(synonyms[0])
                 else:
                     # we add a new synonym object
-                    oil.synonyms.append(Synonym(s))
+                    synonym = Synonym(s)
+                    oil.synonyms.append(synonym)
+
+                    if known_synonyms is not None:
+                        known_synonyms[s] = synonym
 
 
 def add_densities(oil, row_dict):
@@ -6,8 +6,15 @@
     with the Oil object.  This is where we will place the estimated oil
     properties.
 '''
-from math import log, log10, exp, fabs
+from __future__ import print_function
+
+import logging
+from math import log, exp, fabs
+from bisect import bisect_left
+from collections import OrderedDict
+
 import transaction
+from sqlalchemy.orm import subqueryload
 
 import numpy
 np = numpy
@@ -15,47 +22,216 @@ np = numpy
 from oil_library.models import (ImportedRecord, Oil, Estimated,
                                 Density, KVis, Cut,
                                 SARAFraction, SARADensity,
-                                MolecularWeight)
+                                MolecularWeight,
+                                assign_primary_keys,
+                                SATURATES, AROMATICS, RESINS, ASPHALTENES)
 
 from oil_library.utilities import (get_boiling_points_from_api,
                                    get_viscosity)
 
+logger = logging.getLogger(__name__)
+
+# reference temperature (15C) for most of our estimations
+_T15 = 273.15 + 15
+# numerator of the API gravity <--> density (kg/m^3) relation
+_API_NUM = 141.5 * 1000
+# viscosity/temperature correction constant
+_C_V1 = 5000.0
+# watson characterization factors for our trial component densities
+_watson_factors = {SATURATES: 12, AROMATICS: 10}
+
+# np.isclose() is very slow for comparing two scalars, so for our
+# 'is this a 15C value' checks we precompute the same tolerance it would
+# use (atol + rtol * abs(b)) and compare directly.
+_T_15C = 273.0 + 15
+_T_15C_TOLERANCE = .15 + 1e-5 * _T_15C
+
+
+def is_15c(temperature):
+    return abs(temperature - _T_15C) <= _T_15C_TOLERANCE
+
 
 def process_oils(session):
-    print '\nAdding Oil objects...'
-    for rec in session.query(ImportedRecord):
-        add_oil(rec)
+    print('\nAdding Oil objects...')
+    # load all the related objects our estimations need up front, rather
+    # than with a separate lazy query per record and relationship.
+    records = (session.query(ImportedRecord)
+               .options(subqueryload(ImportedRecord.densities),
+                        subqueryload(ImportedRecord.kvis),
+                        subqueryload(ImportedRecord.dvis),
+                        subqueryload(ImportedRecord.cuts))
+               .all())
+
+    with session.no_autoflush:
+        oils = add_oils(records)
+        # so our new rows can be inserted in batches
+        assign_primary_keys(session, new_oil_objects(oils))
 
     transaction.commit()
 
 
+def new_oil_objects(oils):
+    '''
+        All the objects created by our estimations
+    '''
+    for oil in oils:
+        yield oil
+        yield oil.estimated
+
+        for related in (oil.densities, oil.kvis, oil.cuts,
+                        oil.sara_fractions, oil.sara_densities,
+                        oil.molecular_weights):
+            for obj in related:
+                yield obj
+
+
 def add_oil(record):
-    print 'Estimations for {0}'.format(record.adios_oil_id)
-    oil = Oil()
-    oil.estimated = Estimated()
-
-    add_demographics(record, oil)
-    add_densities(record, oil)
-    add_viscosities(record, oil)
-    add_oil_water_interfacial_tension(record, oil)
-    # TODO: should we add oil/seawater tension as well???
-    add_pour_point(record, oil)
-    add_flash_point(record, oil)
-    add_emulsion_water_fraction_max(record, oil)
-
-    add_resin_fractions(record, oil)
-    add_asphaltene_fractions(record, oil)
-
-    add_bullwinkle_fractions(record, oil)
-    add_adhesion(record, oil)
-    add_sulphur_mass_fraction(record, oil)
-    add_soluability(record, oil)
-    add_distillation_cut_boiling_point(record, oil)
-    add_molecular_weights(record, oil)
-    add_component_densities(record, oil)
-    add_saturate_aromatic_fractions(record, oil)
-
-    record.oil = oil
+    return add_oils([record])[0]
+
+
+def add_oils(records):
+    '''
+        Most of our estimations depend on the related objects of a single
+        record, and are done one record at a time.  But the closed form
+        estimations (pour point, interfacial tension, flash point,
+        bullwinkle) only depend on a few scalar columns, so we gather those
+        columns for the whole batch of records into numpy arrays, estimate
+        them in one vectorized pass, and then scatter the results back into
+        our Oil objects.
+
+        Note: this is done in a single process on purpose.  What is left
+              of the per-record work is mostly building ORM objects, which
+              are tied to our session.  Farming the records out to worker
+              processes would mean pickling every record and its related
+              objects there and back, and merging the results into the
+              session.  That costs more than the estimations themselves.
+    '''
+    oils = []
+    for record in records:
+        logger.info('Estimations for %s', record.adios_oil_id)
+        oil = Oil()
+        oil.estimated = Estimated()
+
+        add_demographics(record, oil)
+        add_densities(record, oil)
+        add_viscosities(record, oil)
+        add_emulsion_water_fraction_max(record, oil)
+
+        oils.append(oil)
+
+    # our resin & asphaltene estimations need the pour point
+    pour_points = estimate_pour_points(oils)
+
+    for record, oil, pp in zip(records, oils, pour_points):
+        add_pour_point(record, oil, pp)
+
+        add_resin_fractions(record, oil)
+        add_asphaltene_fractions(record, oil)
+
+    estimations = estimate_closed_form_properties(records, oils)
+
+    for record, oil, est in zip(records, oils, estimations):
+        add_oil_water_interfacial_tension(record, oil, est)
+        # TODO: should we add oil/seawater tension as well???
+        add_flash_point(record, oil, est)
+
+        add_bullwinkle_fractions(record, oil, est)
+        add_adhesion(record, oil)
+        add_sulphur_mass_fraction(record, oil)
+        add_soluability(record, oil)
+        add_distillation_cut_boiling_point(record, oil)
+        add_molecular_weights(record, oil)
+        add_component_densities(record, oil)
+        add_saturate_aromatic_fractions(record, oil)
+
+        record.oil = oil
+
+    return oils
+
+
+def estimate_closed_form_properties(records, oils):
+    '''
+        Vectorized estimation of the oil properties that have a closed
+        form solution.  Our records are laid out as a structure of arrays,
+        one array per input column, and we return a numpy record array with
+        one row per oil containing the estimated values, along with the
+        flags telling us whether the value was estimated or measured.
+
+        Rows that have a measured value simply carry that value through.
+    '''
+    def column(values, dtype=np.float64):
+        return as_column(values, len(records), dtype)
+
+    api = column(none_to_nan(o.api) for o in oils)
+
+    iftn_measured = column(none_to_nan(r.oil_water_interfacial_tension_n_m)
+                           for r in records)
+    fp_measured = column(((r.flash_point_min_k is not None or
+                           r.flash_point_max_k is not None)
+                          for r in records), np.bool_)
+    cut_1_temp = column(min(c.vapor_temp_k for c in r.cuts)
+                        if len(r.cuts) > 0 else np.nan
+                        for r in records)
+    f_asph = column(get_asphaltene_fraction(o) for o in oils)
+    ni = column((r.nickel if r.nickel is not None else 0.0)
+                for r in records)
+    va = column((r.vanadium if r.vanadium is not None else 0.0)
+                for r in records)
+    refined = column(((r.product_type == "refined") for r in records),
+                     np.bool_)
+
+    est = np.zeros((len(records),),
+                   dtype=[('oil_water_interfacial_tension_n_m', np.float64),
+                          ('oil_water_interfacial_tension_estimated',
+                           np.bool_),
+                          ('flash_point_max_k', np.float64),
+                          ('flash_point_estimated', np.bool_),
+                          ('bullwinkle_fraction', np.float64)])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # interfacial tension from api
+        iftn_estimated = np.isnan(iftn_measured)
+        est['oil_water_interfacial_tension_n_m'] = \
+            np.where(iftn_estimated, 0.001 * (39 - 0.2571 * api),
+                     iftn_measured)
+        est['oil_water_interfacial_tension_estimated'] = iftn_estimated
+
+        # flash point from our first distillation cut, or else from api
+        est['flash_point_max_k'] = np.where(np.isnan(cut_1_temp),
+                                            457.0 - 3.34 * api,
+                                            117.0 + 0.69 * cut_1_temp)
+        est['flash_point_estimated'] = ~fp_measured
+
+        # bullwinkle fraction
+        # note: -log10(1 / api) == log10(api)
+        bullwinkle_api = np.where(api < 26.0, 0.08,
+                                  np.where(api > 50.0, 0.303,
+                                           -1.038 + 0.78935 * np.log10(api)))
+        bullwinkle_asph = np.clip(0.20219 - 0.168 * np.log10(f_asph),
+                                  0.0, 0.303)
+
+        bullwinkle = np.where(f_asph > 0.0, bullwinkle_asph, bullwinkle_api)
+        bullwinkle[(ni > 0.0) & (va > 0.0) & (ni + va > 15.0)] = 0.0
+        bullwinkle[refined] = 1.0
+
+        est['bullwinkle_fraction'] = bullwinkle
+
+    return est
+
+
+def as_column(values, count, dtype=np.float64):
+    '''
+        Gather an iterable of per-record values into a numpy array
+    '''
+    return np.fromiter(values, dtype=dtype, count=count)
+
+
+def none_to_nan(v):
+    return np.nan if v is None else v
+
+
+def nan_to_none(v):
+    return None if np.isnan(v) else v
 
 
 def add_demographics(imported_rec, oil):
@@ -86,16 +262,15 @@ def add_densities(imported_rec, oil):
         oil.api = imported_rec.api
     elif oil.densities:
         # estimate our api from density
-        d_0 = density_at_temperature(oil, 273.15 + 15)
+        d_0 = density_at_temperature(oil, _T15)
 
-        oil.api = (141.5 * 1000 / d_0) - 131.5
+        oil.api = (_API_NUM / d_0) - 131.5
         oil.estimated.api = True
     else:
-        print ('Warning: no densities and no api for record {0}'
-               .format(imported_rec.adios_oil_id))
+        logger.warning('no densities and no api for record %s',
+                       imported_rec.adios_oil_id)
 
-    if not [d for d in oil.densities
-            if np.isclose(d.ref_temp_k, 273.0 + 15, atol=.15)]:
+    if not [d for d in oil.densities if is_15c(d.ref_temp_k)]:
         # add a 15C density from api
         kg_m_3, ref_temp_k = estimate_density_from_api(oil.api)
 
@@ -106,21 +281,73 @@ def add_densities(imported_rec, oil):
 
 
 def estimate_density_from_api(api):
-    kg_m_3 = 141.5 / (131.5 + api) * 1000
-    ref_temp_k = 273.15 + 15
+    return _API_NUM / (131.5 + api), _T15
 
-    return kg_m_3, ref_temp_k
+
+def reference_densities(oil_rec, weathering=0.0):
+    '''
+        Get the reference temperatures and densities of our record at a
+        particular weathering, sorted by temperature.  We also return the
+        original position of each density in the record, which we use to
+        break ties between equally close temperatures.
+    '''
+    densities = sorted((d.ref_temp_k, i, d.kg_m_3)
+                       for i, d in enumerate(oil_rec.densities)
+                       if d.weathering == weathering and d.kg_m_3 is not None)
+
+    return ([d[0] for d in densities],
+            [d[2] for d in densities],
+            [d[1] for d in densities])
+
+
+def unweathered_densities(oil_rec):
+    '''
+        Almost all of our density lookups are for the unweathered densities
+        so we cache the sorted references on our record, along with the
+        densities we have already computed from them.
+
+        Our estimations only ever append densities to a record, so the cache
+        is rebuilt whenever the number of densities has changed.
+    '''
+    cache = getattr(oil_rec, '_dens_sorted', None)
+
+    if cache is None or cache['count'] != len(oil_rec.densities):
+        cache = {'count': len(oil_rec.densities),
+                 'refs': reference_densities(oil_rec),
+                 'at_temp': {}}
+        oil_rec._dens_sorted = cache
+
+    return cache
 
 
 def density_at_temperature(oil_rec, temperature, weathering=0.0):
-    # first, get the density record closest to our temperature
-    density_list = [(d, abs(d.ref_temp_k - temperature))
-                    for d in oil_rec.densities
-                    if d.weathering == weathering]
-    if density_list:
-        density_rec = sorted(density_list, key=lambda d: d[1])[0][0]
-        d_ref = density_rec.kg_m_3
-        t_ref = density_rec.ref_temp_k
+    if weathering == 0.0:
+        cache = unweathered_densities(oil_rec)
+        refs = cache['refs']
+
+        if len(refs[0]) > 0:
+            # memoize our results.  Only densities computed from measured
+            # values are memoized, since the api could still change.
+            at_temp = cache['at_temp']
+            if temperature not in at_temp:
+                at_temp[temperature] = _density_at_temperature(oil_rec, refs,
+                                                                temperature)
+
+            return at_temp[temperature]
+    else:
+        refs = reference_densities(oil_rec, weathering)
+
+    return _density_at_temperature(oil_rec, refs, temperature)
+
+
+def _density_at_temperature(oil_rec, refs, temperature):
+    temps, rhos, order = refs
+
+    if len(temps) > 0:
+        # first, get the density record closest to our temperature
+        idx = nearest_temperature_idx(temps, order, temperature)
+        d_ref = rhos[idx]
+        t_ref = temps[idx]
     else:
         if oil_rec.api is None:
             # We have no densities at our requested weathering, and no api
@@ -130,7 +357,7 @@ def density_at_temperature(oil_rec, temperature, weathering=0.0):
             d_ref, t_ref = estimate_density_from_api(oil_rec.api)
 
     k_pt = 0.008
-    if density_list and fabs(t_ref - temperature) > (1 / k_pt):
+    if len(temps) > 0 and fabs(t_ref - temperature) > (1 / k_pt):
         # even if we got some measured densities, they could be at
         # temperatures that is out of range for our algorithm.
         return None
@@ -138,6 +365,30 @@ def density_at_temperature(oil_rec, temperature, weathering=0.0):
     return d_ref / (1 - k_pt * (t_ref - temperature))
 
 
+def nearest_temperature_idx(temps, order, temperature):
+    '''
+        Binary search our sorted (non-empty) temperatures for the one
+        closest to our temperature.  Ties go to the reference that came
+        first in the record, just like picking the first one of a stable
+        sort by distance would.
+    '''
+    hi = bisect_left(temps, temperature)
+
+    if hi == 0:
+        return hi
+    elif hi == len(temps):
+        return bisect_left(temps, temps[-1])
+
+    lo = bisect_left(temps, temps[hi - 1])
+    d_lo = temperature - temps[lo]
+    d_hi = temps[hi] - temperature
+
+    if d_lo < d_hi or (d_lo == d_hi and order[lo] < order[hi]):
+        return lo
+    else:
+        return hi
+
+
 def add_viscosities(imported_rec, oil):
         '''
             Get a list of all kinematic viscosities associated with this
@@ -175,12 +426,18 @@ def get_kvis(imported_rec):
         viscosities = []
     estimated = [False] * len(viscosities)
 
+    # the (temperature, weathering) pairs we already have a kvis for
+    seen = set((t, w) for _kv, t, w in viscosities)
+    add_seen = seen.add
+    add_viscosity, add_estimated = viscosities.append, estimated.append
+
     for kv, t, w in get_kvis_from_dvis(imported_rec):
-        if kvis_exists_at_temp_and_weathering(viscosities, t, w):
+        if (t, w) in seen:
             continue
 
-        viscosities.append((kv, t, w))
-        estimated.append(True)
+        add_seen((t, w))
+        add_viscosity((kv, t, w))
+        add_estimated(True)
 
     return viscosities, estimated
 
@@ -194,52 +451,44 @@ def get_kvis_from_dvis(oil_rec):
         the density at our reference temperature and weathering
     '''
     kvis_out = []
+    add_kvis = kvis_out.append
 
-    if oil_rec.dvis:
+    dvis = oil_rec.dvis
+    if dvis:
         for dv, t, w in [(d.kg_ms,
                          d.ref_temp_k,
                          (0.0 if d.weathering is None else d.weathering))
-                         for d in oil_rec.dvis
+                         for d in dvis
                          if d.kg_ms > 0.0]:
             density = density_at_temperature(oil_rec, t, w)
 
             # kvis = dvis/density
             if density is not None:
-                kvis_out.append(((dv / density), t, w))
+                add_kvis(((dv / density), t, w))
 
     return kvis_out
 
 
-def kvis_exists_at_temp_and_weathering(kvis, temperature, weathering):
-    return len([v for v in kvis
-                if v[1] == temperature
-                and v[2] == weathering]) > 0
-
-
-def add_oil_water_interfacial_tension(imported_rec, oil):
-    if imported_rec.oil_water_interfacial_tension_n_m is not None:
-        oil.oil_water_interfacial_tension_n_m = \
-            imported_rec.oil_water_interfacial_tension_n_m
-        oil.oil_water_interfacial_tension_ref_temp_k = \
-            imported_rec.oil_water_interfacial_tension_ref_temp_k
-    else:
-        # estimate values from api
-        if imported_rec.api is not None:
-            api = imported_rec.api
-        elif oil.api is not None:
-            api = oil.api
-        else:
-            api = None
+def add_oil_water_interfacial_tension(imported_rec, oil, estimations):
+    '''
+        If we have a measured interfacial tension, we copy it over.
+        Otherwise it is estimated from the api
+        (see estimate_closed_form_properties()).
+    '''
+    oil.oil_water_interfacial_tension_n_m = \
+        estimations['oil_water_interfacial_tension_n_m']
 
-        oil.oil_water_interfacial_tension_n_m = (0.001 * (39 - 0.2571 * api))
-        oil.oil_water_interfacial_tension_ref_temp_k = 273.15 + 15.0
+    if estimations['oil_water_interfacial_tension_estimated']:
+        oil.oil_water_interfacial_tension_ref_temp_k = _T15
 
         oil.estimated.oil_water_interfacial_tension_n_m = True
         oil.estimated.oil_water_interfacial_tension_ref_temp_k = True
-    pass
+    else:
+        oil.oil_water_interfacial_tension_ref_temp_k = \
+            imported_rec.oil_water_interfacial_tension_ref_temp_k
 
 
-def add_pour_point(imported_rec, oil):
+def add_pour_point(imported_rec, oil, pp_estimate):
     '''
         If we already have pour point min-max values in our imported
         record, then we are good.  We simply copy them over.
@@ -275,33 +524,46 @@ def add_pour_point(imported_rec, oil):
         oil.pour_point_min_k = imported_rec.pour_point_min_k
         oil.pour_point_max_k = imported_rec.pour_point_max_k
     else:
+        # TODO: When would we have molecular weights?
+        #       If we have measured molecular weights for the
+        #       distillation fractions, then we would use method 'A'
         oil.pour_point_min_k = None
-        if 0:
-            # TODO: When would we have molecular weights?
-            # if we have measured molecular weights for the
-            # distillation fractions, then we use method 'A'
-            # oil.pour_point_max_k = \
-            #     estimate_pp_by_molecular_weights(imported_rec)
-            pass
-        else:
-            oil.pour_point_max_k = estimate_pp_by_viscosity_ref(imported_rec)
+
+        # estimate_pour_points() gives NaN for oils without viscosities,
+        # which we leave without a pour point
+        oil.pour_point_max_k = None if np.isnan(pp_estimate) else pp_estimate
 
         oil.estimated.pour_point_min_k = True
         oil.estimated.pour_point_max_k = True
 
 
-def estimate_pp_by_viscosity_ref(imported_rec):
-    # Get the viscosity measured at the lowest reference temperature
-    kvis_rec = sorted(get_kvis(imported_rec)[0],
-                      key=lambda x: (x[2], x[1]))[0]
+def estimate_pour_points(oils):
+    '''
+        Estimate the pour point (method 'B') for a batch of oils.
+        Oils that have no viscosities get NaN.
+
+        We use the viscosity measured at the lowest reference temperature.
+        Our oil viscosities are already sorted by (weathering, temperature)
+        so this is simply the first one.
+    '''
+    v_ref = as_column((o.kvis[0].m_2_s if o.kvis else np.nan
+                       for o in oils), len(oils))
+    t_ref = as_column((o.kvis[0].ref_temp_k if o.kvis else np.nan
+                       for o in oils), len(oils))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return estimate_pp_by_viscosity_ref(v_ref, t_ref)
 
-    v_ref, t_ref = kvis_rec[0], kvis_rec[1]
-    c_v1 = 5000.0
 
-    return (c_v1 * t_ref) / (c_v1 - t_ref * log(v_ref))
+def estimate_pp_by_viscosity_ref(v_ref, t_ref):
+    '''
+        Works on scalars or numpy arrays of reference viscosities and
+        temperatures.
+    '''
+    return (_C_V1 * t_ref) / (_C_V1 - t_ref * np.log(v_ref))
 
 
-def add_flash_point(imported_rec, oil):
+def add_flash_point(imported_rec, oil, estimations):
     '''
         If we already have flash point min-max values in our imported
         record, then we are good.  We simply copy them over.
@@ -313,45 +575,22 @@ def add_flash_point(imported_rec, oil):
                 T_flsh = 117 + 0.69 * T_cut1
         else:
             (B) T_flsh = 457 - 3.34 * api
+
+        The approximation is done for the whole batch of oils in
+        estimate_closed_form_properties()
     '''
-    if (imported_rec.flash_point_min_k is not None or
-            imported_rec.flash_point_max_k is not None):
+    if not estimations['flash_point_estimated']:
         # we have values to copy over
         oil.flash_point_min_k = imported_rec.flash_point_min_k
         oil.flash_point_max_k = imported_rec.flash_point_max_k
     else:
         oil.flash_point_min_k = None
-        if len(imported_rec.cuts) > 0:
-            # if we have measured distillation cuts, then we use method 'A'
-            oil.flash_point_max_k = estimate_fp_by_cut(imported_rec)
-        else:
-            # we use method 'B'
-            oil.flash_point_max_k = estimate_fp_by_api(oil)
+        oil.flash_point_max_k = estimations['flash_point_max_k']
 
         oil.estimated.flash_point_min_k = True
         oil.estimated.flash_point_max_k = True
 
 
-def estimate_fp_by_cut(imported_rec):
-    '''
-        If we have measured distillation cut data:
-            (A) T_cut1 = the boiling point of the first pseudo-component cut.
-                T_flsh = 117 + 0.69 * T_cut1
-    '''
-    temp_cut_1 = sorted(imported_rec.cuts,
-                        key=lambda x: x.vapor_temp_k)[0].vapor_temp_k
-
-    return 117.0 + 0.69 * temp_cut_1
-
-
-def estimate_fp_by_api(imported_rec):
-    '''
-        If we do *not* have measured distillation cut data, then use api:
-            (B) T_flsh = 457 - 3.34 * api
-    '''
-    return 457.0 - 3.34 * imported_rec.api
-
-
 def add_emulsion_water_fraction_max(imported_rec, oil):
     '''
         This quantity will be set after the emulsification approach in ADIOS3
@@ -368,47 +607,49 @@ def add_emulsion_water_fraction_max(imported_rec, oil):
 
 
 def add_resin_fractions(imported_rec, oil):
-    try:
-        if (imported_rec.resins is not None and
-                imported_rec.resins >= 0.0 and
-                imported_rec.resins <= 1.0):
-            f_res = imported_rec.resins
-            t = 273.15 + 15
-        else:
-            a, b, t = get_corrected_density_and_viscosity(oil)
+    if (imported_rec.resins is not None and
+            imported_rec.resins >= 0.0 and
+            imported_rec.resins <= 1.0):
+        f_res = imported_rec.resins
+        t = _T15
+    else:
+        a, b, t = get_corrected_density_and_viscosity(oil)
 
-            f_res = (3.3 * a + 0.087 * b - 74.0)
-            f_res /= 100.0  # percent to fractional value
-            f_res = 0.0 if f_res < 0.0 else f_res
+        if a is None:
+            logger.warning('Failed to add Resin fraction!')
+            return
 
-        oil.sara_fractions.append(SARAFraction(sara_type='Resins',
-                                               fraction=f_res,
-                                               ref_temp_k=t))
-    except:
-        print 'Failed to add Resin fraction!'
+        f_res = (3.3 * a + 0.087 * b - 74.0)
+        f_res /= 100.0  # percent to fractional value
+        f_res = 0.0 if f_res < 0.0 else f_res
+
+    oil.sara_fractions.append(SARAFraction(sara_type=RESINS,
+                                           fraction=f_res,
+                                           ref_temp_k=t))
 
 
 def add_asphaltene_fractions(imported_rec, oil):
-    try:
-        if (imported_rec.asphaltene_content is not None and
-                imported_rec.asphaltene_content >= 0.0 and
-                imported_rec.asphaltene_content <= 1.0):
-            f_asph = imported_rec.asphaltene_content
-            t = 273.15 + 15
-        else:
-            a, b, t = get_corrected_density_and_viscosity(oil)
+    if (imported_rec.asphaltene_content is not None and
+            imported_rec.asphaltene_content >= 0.0 and
+            imported_rec.asphaltene_content <= 1.0):
+        f_asph = imported_rec.asphaltene_content
+        t = _T15
+    else:
+        a, b, t = get_corrected_density_and_viscosity(oil)
 
-            f_asph = (0.0014 * (a ** 3.0) +
-                      0.0004 * (b ** 2.0) -
-                      18.0)
-            f_asph /= 100.0  # percent to fractional value
-            f_asph = 0.0 if f_asph < 0.0 else f_asph
+        if a is None:
+            logger.warning('Failed to add Asphaltene fraction!')
+            return
 
-        oil.sara_fractions.append(SARAFraction(sara_type='Asphaltenes',
-                                               fraction=f_asph,
-                                               ref_temp_k=t))
-    except:
-        print 'Failed to add Asphaltene fraction!'
+        f_asph = (0.0014 * (a ** 3.0) +
+                  0.0004 * (b ** 2.0) -
+                  18.0)
+        f_asph /= 100.0  # percent to fractional value
+        f_asph = 0.0 if f_asph < 0.0 else f_asph
+
+    oil.sara_fractions.append(SARAFraction(sara_type=ASPHALTENES,
+                                           fraction=f_asph,
+                                           ref_temp_k=t))
 
 
 def get_corrected_density_and_viscosity(oil):
@@ -420,26 +661,28 @@ def get_corrected_density_and_viscosity(oil):
           the 15C Density
         - Mervs calculations depend on a density measured in g/mL and a
           viscosity measured in mPa.s, so we do a conversion here.
+        - If we don't have a usable density and viscosity at 15C, our
+          coefficients are None.
     '''
-    try:
-        temperature = 273.15 + 15
-        P0_oil = density_at_temperature(oil, temperature)
-        V0_oil = get_viscosity(oil, temperature)
-        a = 10 * exp(0.001 * P0_oil)
-        b = 10 * log(1000.0 * P0_oil * V0_oil)
-
-    except:
-        print 'get_resin_coeffs() generated exception:'
-        print '\toil = ', oil
-        print '\toil.kvis = ', oil.kvis
-        print '\tP0_oil = ', density_at_temperature(oil, temperature)
-        print '\tV0_oil = ', get_viscosity(oil, temperature)
-        raise
+    temperature = _T15
+    P0_oil = density_at_temperature(oil, temperature)
+    V0_oil = get_viscosity(oil, temperature)
+
+    if P0_oil is None or V0_oil is None or P0_oil * V0_oil <= 0.0:
+        logger.warning('no usable 15C density and viscosity for %s:\n'
+                       '\toil.kvis = %s\n'
+                       '\tP0_oil = %s\n'
+                       '\tV0_oil = %s',
+                       oil, oil.kvis, P0_oil, V0_oil)
+        return None, None, temperature
+
+    a = 10 * exp(0.001 * P0_oil)
+    b = 10 * log(1000.0 * P0_oil * V0_oil)
 
     return a, b, temperature
 
 
-def add_bullwinkle_fractions(imported_rec, oil):
+def add_bullwinkle_fractions(imported_rec, oil, estimations):
     '''
         This is the mass fraction that must evaporate or dissolve before
         stable emulsification can begin.
@@ -448,43 +691,42 @@ def add_bullwinkle_fractions(imported_rec, oil):
         - This is a scalar value calculated with a reference temperature of 15C
         - For right now we are referencing the Adios2 code file
           OilInitialize.cpp, function CAdiosData::Bullwinkle(void)
+        - The calculation is done for the whole batch of oils in
+          estimate_closed_form_properties()
     '''
-    if imported_rec.product_type == "refined":
-        bullwinkle_fraction = 1.0
-    else:
-        # product type is crude
-        Ni = (imported_rec.nickel
-              if imported_rec.nickel is not None else 0.0)
-        Va = (imported_rec.vanadium
-              if imported_rec.vanadium is not None else 0.0)
-        f_asph = [af.fraction
-                  for af in oil.sara_fractions
-                  if af.sara_type == 'Asphaltenes'
-                  and af.fraction > 0
-                  and np.isclose(af.ref_temp_k, 273.0 + 15, atol=.15)]
-        f_asph = f_asph[0] if len(f_asph) > 0 else 0.0
-
-        if (Ni > 0.0 and Va > 0.0 and Ni + Va > 15.0):
-            bullwinkle_fraction = 0.0
-        elif f_asph > 0.0:
-            # Bullvalue = 0.32 - 3.59 * f_Asph
-            bullwinkle_fraction = 0.20219 - 0.168 * log10(f_asph)
-
-            if bullwinkle_fraction < 0.0:
-                bullwinkle_fraction = 0.0
-            elif bullwinkle_fraction > 0.303:
-                bullwinkle_fraction = 0.303
-        elif oil.api < 26.0:
-            bullwinkle_fraction = 0.08
-        elif oil.api > 50.0:
-            bullwinkle_fraction = 0.303
-        else:
-            bullwinkle_fraction = -1.038 - 0.78935 * log10(1.0 / oil.api)
-
-    oil.bullwinkle_fraction = bullwinkle_fraction
+    oil.bullwinkle_fraction = estimations['bullwinkle_fraction']
     oil.estimated.bullwinkle_fraction = True
 
 
+def get_asphaltene_fraction(oil):
+    '''
+        Our asphaltene fraction at 15C, or 0.0 if we don't have a valid one.
+    '''
+    f_asph = [af.fraction
+              for af in get_ra_fractions(oil)
+              if af.sara_type == ASPHALTENES
+              and af.fraction > 0
+              and is_15c(af.ref_temp_k)]
+
+    return f_asph[0] if len(f_asph) > 0 else 0.0
+
+
+def get_ra_fractions(oil):
+    '''
+        The resin and asphaltene fractions of our oil.  These are estimated
+        before any of the estimations that use them, and they don't change
+        afterwards, so we look them up once and keep them on the oil.
+    '''
+    ra_fractions = getattr(oil, '_ra_cache', None)
+
+    if ra_fractions is None:
+        ra_fractions = [f for f in oil.sara_fractions
+                        if f.sara_type in (RESINS, ASPHALTENES)]
+        oil._ra_cache = ra_fractions
+
+    return ra_fractions
+
+
 def add_adhesion(imported_rec, oil):
     '''
         This is currently not used by the model, but we will get it
@@ -527,6 +769,9 @@ def add_distillation_cut_boiling_point(imported_rec, oil):
         else:
             get a single cut from the API
     '''
+    oil_cuts = oil.cuts
+    add_cut = oil_cuts.append
+
     for c in imported_rec.cuts:
         # Most of our oils seem to be fractional amounts regardless of
         # the stated cut units.  There are only a small number of outliers
@@ -534,84 +779,122 @@ def add_distillation_cut_boiling_point(imported_rec, oil):
         # - 55 are between 1.0 and 10.0 which could possibly be percent
         #   values, but since they are so low, it is unlikely.
         if c.fraction >= 0.0 and c.fraction <= 1.0:
-            oil.cuts.append(c)
+            add_cut(c)
         else:
-            print ('{0}: {1}: bad distillation cut!'.format(imported_rec, c))
+            logger.warning('%s: %s: bad distillation cut!', imported_rec, c)
 
-    if not oil.cuts:
+    if not oil_cuts:
         mass_left = 1.0
 
-        mass_left -= sum([f.fraction for f in oil.sara_fractions
-                          if f.sara_type in ('Resins', 'Asphaltenes')])
+        mass_left -= sum([f.fraction for f in get_ra_fractions(oil)])
         # if imported_rec.resins:
         #     mass_left -= imported_rec.resins
         #
         # if imported_rec.asphaltene_content:
         #     mass_left -= imported_rec.asphaltene_content
 
-        summed_boiling_points = []
+        # saturate and aromatic components share the same boiling points,
+        # so we sum up the fractions of each unique boiling point.
+        summed_boiling_points = OrderedDict()
         for t, f in get_boiling_points_from_api(5, mass_left, oil.api):
-            added_to_sums = False
-
-            for idx, [ut, summed_value] in enumerate(summed_boiling_points):
-                if np.isclose(t, ut):
-                    summed_boiling_points[idx][1] += f
-                    added_to_sums = True
-                    break
-
-            if added_to_sums is False:
-                summed_boiling_points.append([t, f])
+            key = round(t, 6)
+            if key in summed_boiling_points:
+                summed_boiling_points[key][1] += f
+            else:
+                summed_boiling_points[key] = [t, f]
 
         accumulated_frac = 0.0
-        for t_i, fraction in summed_boiling_points:
+        for t_i, fraction in summed_boiling_points.itervalues():
             accumulated_frac += fraction
-            oil.cuts.append(Cut(fraction=accumulated_frac, vapor_temp_k=t_i))
+            add_cut(Cut(fraction=accumulated_frac, vapor_temp_k=t_i))
 
         oil.estimated.cuts = True
 
 
 def add_molecular_weights(imported_rec, oil):
-    for c in oil.cuts:
-        saturate = get_saturate_molecular_weight(c.vapor_temp_k)
-        aromatic = get_aromatic_molecular_weight(c.vapor_temp_k)
+    T_i = np.array([c.vapor_temp_k for c in oil.cuts], dtype=np.float64)
+
+    saturates = get_saturate_molecular_weight(T_i)
+    aromatics = get_aromatic_molecular_weight(T_i)
 
-        oil.molecular_weights.append(MolecularWeight(saturate=saturate,
-                                                     aromatic=aromatic,
-                                                     ref_temp_k=c.vapor_temp_k)
-                                     )
+    for c, saturate, aromatic in zip(oil.cuts, saturates, aromatics):
+        oil.molecular_weights.append(
+            MolecularWeight(saturate=nan_to_none(saturate),
+                            aromatic=nan_to_none(aromatic),
+                            ref_temp_k=c.vapor_temp_k)
+        )
 
 
 def get_saturate_molecular_weight(vapor_temp):
     '''
         (Reference: CPPF, eq. 2.48 and table 2.6)
+        Takes a numpy array of vapor temperatures.  Temperatures at or
+        above 1070K have no molecular weight, and are set to NaN.
     '''
-    if vapor_temp < 1070.0:
-        return (49.7 * (6.983 - log(1070.0 - vapor_temp))) ** (3. / 2.)
-    else:
-        return None
+    return _molecular_weight(vapor_temp, 49.7, 6.983, 1070.0)
 
 
 def get_aromatic_molecular_weight(vapor_temp):
     '''
         (Reference: CPPF, eq. 2.48 and table 2.6)
+        Takes a numpy array of vapor temperatures.  Temperatures at or
+        above 1015K have no molecular weight, and are set to NaN.
     '''
-    if vapor_temp < 1015.0:
-        return (44.5 * (6.91 - log(1015.0 - vapor_temp))) ** (3. / 2.)
-    else:
-        return None
+    return _molecular_weight(vapor_temp, 44.5, 6.91, 1015.0)
+
+
+def _molecular_weight(vapor_temp, c_1, c_2, max_temp):
+    '''
+        M_w = (c_1 * (c_2 - ln(max_temp - T))) ^ (3/2)
+        The log is masked so we never take it of a non-positive value.
+    '''
+    valid = vapor_temp < max_temp
+    delta_t = np.where(valid, max_temp - vapor_temp, 1.0)
+
+    return np.where(valid,
+                    np.power(c_1 * (c_2 - np.log(delta_t)), 1.5),
+                    np.nan)
 
 
 def add_saturate_aromatic_fractions(imported_rec, oil):
-    for f_sat, f_arom, T_i in get_sa_mass_fractions(oil):
-        oil.sara_fractions.append(SARAFraction(sara_type='Saturates',
-                                               fraction=f_sat,
-                                               ref_temp_k=T_i))
-        oil.sara_fractions.append(SARAFraction(sara_type='Aromatics',
-                                               fraction=f_arom,
-                                               ref_temp_k=T_i))
+    T_i, F_i, mw_sat = get_cut_arrays(oil)
+    f_sat, f_arom, valid = get_sa_mass_fractions(T_i, F_i, mw_sat)
+
+    if not valid.all():
+        logger.info('\tNo molecular weight at that temperature.')
+
+    for f_s, f_a, t in zip(f_sat[valid], f_arom[valid], T_i[valid]):
+        oil.sara_fractions.append(SARAFraction(sara_type=SATURATES,
+                                               fraction=f_s,
+                                               ref_temp_k=t))
+        oil.sara_fractions.append(SARAFraction(sara_type=AROMATICS,
+                                               fraction=f_a,
+                                               ref_temp_k=t))
+
+
+def get_cut_arrays(oil_obj):
+    '''
+        Get the numpy arrays describing our distillation cuts:
+        - T_i: the vapor temperature of each cut
+        - F_i: the mass fraction of each cut.  Our cuts are stored as
+               cumulative fractions.
+        - mw_sat: the saturate molecular weight at the temperature of each
+                  cut, or NaN if we don't have one.
+    '''
+    T_i = np.array([c.vapor_temp_k for c in oil_obj.cuts], dtype=np.float64)
+    F_i = np.diff(np.concatenate([[0.0], [c.fraction for c in oil_obj.cuts]]))
+
+    # our molecular weights were computed at the cut temperatures, so we
+    # can look them up by (rounded) temperature.
+    mw_by_temp = dict((round(v.ref_temp_k, 6), v.saturate)
+                      for v in oil_obj.molecular_weights)
+    mw_sat = np.array([mw_by_temp.get(round(t, 6)) for t in T_i],
+                      dtype=np.float64)
 
+    return T_i, F_i, mw_sat
 
-def get_ptry_values(oil_obj, component_type, sub_fraction=None):
+
+def get_ptry_values(T_i, component_type):
     '''
         This gives an initial trial estimate for each density component.
 
@@ -619,33 +902,22 @@ def get_ptry_values(oil_obj, component_type, sub_fraction=None):
         combined with the fractionally weighted average resin and asphaltene
         densities, should match the measured total oil density.
 
-        :param oil_obj: an oil database object
-        :param watson_factor: The characterization factor originally defined
-                              by Watson et al. of the Universal Oil Products
-                              in the mid 1930's
-                              (Reference: CPPF, section 2.1.15 )
-        :param sub_fraction: a list of fractions to be used in lieu of the
-                             calculated cut fractions in the database.
-    '''
-    watson_factors = {'Saturates': 12, 'Aromatics': 10}
-    watson_factor = watson_factors[component_type]
-
-    previous_cut_fraction = 0.0
-    for idx, c in enumerate(oil_obj.cuts):
-        T_i = c.vapor_temp_k
-
-        F_i = c.fraction - previous_cut_fraction
-        previous_cut_fraction = c.fraction
-
-        P_try = 1000 * (T_i ** (1.0 / 3.0) / watson_factor)
+        :param T_i: numpy array of our distillation cut temperatures
+        :param component_type: Saturates or Aromatics.  This determines
+                               our watson factor, which is the
+                               characterization factor originally defined
+                               by Watson et al. of the Universal Oil Products
+                               in the mid 1930's
+                               (Reference: CPPF, section 2.1.15 )
 
-        if sub_fraction is not None and len(sub_fraction) > idx:
-            F_i = sub_fraction[idx]
+        :returns: numpy array of trial densities, one per cut.
+    '''
+    watson_factor = _watson_factors[component_type]
 
-        yield (P_try, F_i, T_i, component_type)
+    return 1000 * (T_i ** (1.0 / 3.0) / watson_factor)
 
 
-def get_sa_mass_fractions(oil_obj):
+def get_sa_mass_fractions(T_i, F_i, mw_sat):
     '''
         (A) if these hold true:
               - (i): oil library record contains summed mass fractions
@@ -668,35 +940,25 @@ def get_sa_mass_fractions(oil_obj):
             record
               - apply (A) except fmass(i) = 1/5 for all cuts
 
-        dependent on:
-            - oil.molecular_weights[:].saturate
+        All arguments are numpy arrays with one element per distillation
+        cut (see get_cut_arrays()).  We return the saturate and aromatic
+        fraction arrays, and a mask of the cuts we were able to compute.
+        Cuts below 530K need a saturate molecular weight.
     '''
-    for P_try, F_i, T_i, c_type in get_ptry_values(oil_obj, 'Saturates'):
-        if T_i < 530.0:
-            sg = P_try / 1000
-            mw = None
-            for v in oil_obj.molecular_weights:
-                if np.isclose(v.ref_temp_k, T_i):
-                    mw = v.saturate
-                    break
+    low_temp = T_i < 530.0
+    valid = ~(low_temp & np.isnan(mw_sat))
 
-            if mw is not None:
-                f_sat = F_i * (2.2843 - 1.98138 * sg - 0.009108 * mw)
+    sg = get_ptry_values(T_i, SATURATES) / 1000
 
-                if f_sat >= F_i:
-                    f_sat = F_i
-                elif f_sat < 0:
-                    f_sat = 0
+    with np.errstate(invalid='ignore'):
+        f_sat = F_i * (2.2843 - 1.98138 * sg - 0.009108 * mw_sat)
+        f_sat = np.where(f_sat >= F_i, F_i,
+                         np.where(f_sat < 0, 0.0, f_sat))
 
-                f_arom = F_i * (1 - f_sat)
+    f_arom = np.where(low_temp, F_i * (1 - f_sat), F_i / 2)
+    f_sat = np.where(low_temp, f_sat, F_i / 2)
 
-                yield (f_sat, f_arom, T_i)
-            else:
-                print '\tNo molecular weight at that temperature.'
-        else:
-            f_sat = f_arom = F_i / 2
-
-            yield (f_sat, f_arom, T_i)
+    return f_sat, f_arom, valid
 
 
 def add_component_densities(imported_rec, oil):
@@ -705,33 +967,40 @@ def add_component_densities(imported_rec, oil):
         dependent on:
         - P_0_oil: oil density at 15C (estimation 1)
         - fmass_0_j: saturate & aromatic mass fractions (estimation 14,15)
+
+        We first get an initial trial estimate for each saturate and
+        aromatic density component (see get_ptry_values()).
+
+        In theory the fractionally weighted average of these densities,
+        combined with the fractionally weighted average resin and asphaltene
+        densities, should match the measured total oil density.  So we
+        adjust our trial densities to make it so.
+
+        All cuts are handled at once as numpy arrays.
     '''
-    oil.sara_densities.append(SARADensity(sara_type='Asphaltenes',
+    oil.sara_densities.append(SARADensity(sara_type=ASPHALTENES,
                                           density=1100.0))
-    oil.sara_densities.append(SARADensity(sara_type='Resins',
+    oil.sara_densities.append(SARADensity(sara_type=RESINS,
                                           density=1100.0))
 
-    sa_ratios = list(get_sa_mass_fractions(oil))
-    ptry_values = (list(get_ptry_values(oil, 'Saturates',
-                                        [r[0] for r in sa_ratios])) +
-                   list(get_ptry_values(oil, 'Aromatics',
-                                        [r[1] for r in sa_ratios])))
+    T_i, F_i, mw_sat = get_cut_arrays(oil)
+    f_sat, f_arom, valid = get_sa_mass_fractions(T_i, F_i, mw_sat)
+
+    # cuts we couldn't compute use the unsplit cut fraction
+    f_sat = np.where(valid, f_sat, F_i)
+    f_arom = np.where(valid, f_arom, F_i)
+
+    P_sat = get_ptry_values(T_i, SATURATES)
+    P_arom = get_ptry_values(T_i, AROMATICS)
 
-    ra_ptry_values = [(1100.0, f.fraction)
-                      for f in oil.sara_fractions
-                      if f.sara_type in ('Resins', 'Asphaltenes')]
+    total_ra_fraction = sum([f.fraction for f in get_ra_fractions(oil)])
 
-    ptry_avg_density = sum([(P_try * F_i)
-                            for P_try, F_i, T_i, c_type in ptry_values] +
-                           [(P_try * F_i)
-                            for P_try, F_i in ra_ptry_values]
-                           )
+    ptry_avg_density = ((P_sat * f_sat).sum() + (P_arom * f_arom).sum() +
+                        1100.0 * total_ra_fraction)
 
-    total_sa_fraction = sum([F_i for P_try, F_i, T_i, c_type in ptry_values])
+    total_sa_fraction = f_sat.sum() + f_arom.sum()
 
-    total_ra_fraction = sum([f.fraction for f in oil.sara_fractions
-                             if f.sara_type in ('Resins', 'Asphaltenes')])
-    oil_density = density_at_temperature(oil, 288.15)
+    oil_density = density_at_temperature(oil, _T15)
 
     # print ('\n\nNow we will try to adjust our ptry densities '
     #        'to match the oil total density')
@@ -739,10 +1008,10 @@ def add_component_densities(imported_rec, oil):
                           total_sa_fraction)
 
     density_adjustment = oil_sa_avg_density / ptry_avg_density
-    ptry_values = [(P_try * density_adjustment, F_i, T_i, c_type)
-                   for P_try, F_i, T_i, c_type in ptry_values]
 
-    for P_try, F_i, T_i, c_type in ptry_values:
-        oil.sara_densities.append(SARADensity(sara_type=c_type,
-                                              density=P_try,
-                                              ref_temp_k=T_i))
+    add_density = oil.sara_densities.append
+    for c_type, P_try in ((SATURATES, P_sat), (AROMATICS, P_arom)):
+        for P, T in zip(P_try * density_adjustment, T_i):
+            add_density(SARADensity(sara_type=c_type,
+                                    density=P,
+                                    ref_temp_k=T))
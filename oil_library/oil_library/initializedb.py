@@ -1,24 +1,68 @@
+from __future__ import print_function
+
 import os
 import sys
+import logging
 
 import transaction
-from sqlalchemy import engine_from_config
+from sqlalchemy import engine_from_config, event
 
 from .oil_library_parse import OilLibraryFile
 
-from .models import DBSession, Base
+from .models import DBSession, Base, Synonym, assign_primary_keys
 
-from .init_imported_record import purge_old_records, add_oil_object
+from .init_imported_record import (purge_old_records,
+                                   add_oil_object,
+                                   new_imported_objects)
 from .init_categories import process_categories
 from .init_oil import process_oils
 
+logger = logging.getLogger(__name__)
+
+# number of imported records we insert at a time.
+BATCH_SIZE = 10000
+
+# number of rows read per progress dot written to stderr
+PROGRESS_ROWS = 1000
+
 
 def initialize_sql(settings):
     engine = engine_from_config(settings, 'sqlalchemy.')
+
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', set_sqlite_load_pragmas)
+
     DBSession.configure(bind=engine)
     Base.metadata.create_all(engine)
 
 
+def set_sqlite_load_pragmas(dbapi_connection, connection_record):
+    '''
+        This engine is only used to build our database from scratch, and
+        if a build fails we simply build it again.  So we don't need SQLite
+        to sync every write to disk, or to keep its journal on disk.
+    '''
+    cursor = dbapi_connection.cursor()
+
+    for pragma in ('synchronous=OFF',
+                   'journal_mode=MEMORY',
+                   'temp_store=MEMORY'):
+        cursor.execute('PRAGMA {0}'.format(pragma))
+
+    cursor.close()
+
+
+def flush_records(session, batch):
+    '''
+        Insert a batch of new imported records.  Their ids are assigned
+        up front so that each table is written with a single executemany()
+    '''
+    assign_primary_keys(session, new_imported_objects(batch))
+    session.flush()
+
+    del batch[:]
+
+
 def load_database(settings):
     with transaction.manager:
         # -- Our loading routine --
@@ -27,32 +71,45 @@ def load_database(settings):
         # 1. purge our builtin rows if any exist
         sys.stderr.write('Purging old records in database')
         imported_recs_purged, oil_recs_purged = purge_old_records(session)
-        print ('finished!!!\n'
-               '    {0} imported records purged.\n'
-               '    {0} oil records purged.'
-               .format(imported_recs_purged, oil_recs_purged))
+        print('finished!!!\n'
+              '    {0} imported records purged.\n'
+              '    {0} oil records purged.'
+              .format(imported_recs_purged, oil_recs_purged))
 
         # 2. we need to open our OilLib file
-        print 'opening file: %s ...' % (settings['oillib.file'])
+        print('opening file: %s ...' % (settings['oillib.file']))
         fd = OilLibraryFile(settings['oillib.file'])
-        print 'file version:', fd.__version__
+        print('file version:', fd.__version__)
 
         # 3. iterate over our rows
         sys.stderr.write('Adding new records to database')
         rowcount = 0
-        for r in fd.readlines():
-            if len(r) < 10:
-                print 'got record:', r
+        batch = []
+        synonyms = dict((s.name, s) for s in session.query(Synonym))
+
+        with session.no_autoflush:
+            for r in fd:
+                if len(r) < 10:
+                    logger.debug('got short record: {0}'.format(r))
+
+                # 3a. for each row, we populate the Oil object
+                rec = add_oil_object(session, fd.file_columns, r, synonyms)
+                if rec is not None:
+                    batch.append(rec)
+
+                if len(batch) >= BATCH_SIZE:
+                    flush_records(session, batch)
+
+                if rowcount % PROGRESS_ROWS == 0:
+                    sys.stderr.write('.')
 
-            # 3a. for each row, we populate the Oil object
-            add_oil_object(session, fd.file_columns, r)
+                rowcount += 1
 
-            if rowcount % 100 == 0:
-                sys.stderr.write('.')
+            flush_records(session, batch)
 
-            rowcount += 1
+        transaction.commit()
 
-        print 'finished!!!  %d rows processed.' % (rowcount)
+        print('finished!!!  %d rows processed.' % (rowcount))
 
         process_oils(session)
         process_categories(session)
@@ -76,6 +133,6 @@ def make_db(oillib_file=None, db_file=None):
     try:
         initialize_sql(settings)
         load_database(settings)
-    except:
-        print "FAILED TO CREATED OIL LIBRARY DATABASE \n"
+    except Exception:
+        print("FAILED TO CREATED OIL LIBRARY DATABASE \n")
         raise
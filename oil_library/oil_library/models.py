@@ -1,5 +1,8 @@
 
-from sqlalchemy import (Table,
+from collections import defaultdict
+
+from sqlalchemy import (func,
+                        Table,
                         Column,
                         Integer,
                         Text,
@@ -22,6 +25,33 @@ from zope.sqlalchemy import ZopeTransactionExtension
 
 DBSession = scoped_session(sessionmaker(extension=ZopeTransactionExtension()))
 
+
+def assign_primary_keys(session, objs):
+    '''
+        SQLAlchemy can only batch the inserts of a table into a single
+        executemany() if it already knows the primary keys of the new rows.
+        Otherwise it needs to insert the rows one at a time in order to
+        get each new id.  So when we are adding a lot of new objects,
+        we hand out the ids ourselves.
+
+        :param objs: an iterable of new mapped objects, of any class.
+                     Objects that already have an id are left alone.
+    '''
+    new_objs = defaultdict(list)
+    seen = set()
+
+    for obj in objs:
+        if obj.id is None and id(obj) not in seen:
+            seen.add(id(obj))
+            new_objs[type(obj)].append(obj)
+
+    for cls, cls_objs in new_objs.iteritems():
+        next_id = (session.query(func.max(cls.id)).scalar() or 0) + 1
+
+        for obj_id, obj in enumerate(cls_objs, next_id):
+            obj.id = obj_id
+
+
 # Let's make declarative_base a class decorator
 declarative_base = lambda cls: real_declarative_base(cls=cls)
 
@@ -113,6 +143,17 @@ class Base(object):
         return oil_json
 
 
+# Our SARA fraction types.  These are stored as strings in the database,
+# so anything creating or comparing SARA types should use these constants.
+# Comparing two references to the same interned string object is a simple
+# identity check.
+SATURATES = intern('Saturates')
+AROMATICS = intern('Aromatics')
+RESINS = intern('Resins')
+ASPHALTENES = intern('Asphaltenes')
+SARA_TYPES = (SATURATES, AROMATICS, RESINS, ASPHALTENES)
+
+
 # UNMAPPED many-to-many association table
 imported_to_synonym = Table('imported_to_synonym', Base.metadata,
                             Column('imported_record_id', Integer,
@@ -455,8 +496,7 @@ class SARAFraction(Base):
     id = Column(Integer, primary_key=True)
     oil_id = Column(Integer, ForeignKey('oils.id'))
 
-    sara_type = Column(Enum('Saturates', 'Aromatics', 'Resins', 'Asphaltenes'),
-                       nullable=False)
+    sara_type = Column(Enum(*SARA_TYPES), nullable=False)
     fraction = Column(Float(53))
     ref_temp_k = Column(Float(53))
 
@@ -475,8 +515,7 @@ class SARADensity(Base):
     id = Column(Integer, primary_key=True)
     oil_id = Column(Integer, ForeignKey('oils.id'))
 
-    sara_type = Column(Enum('Saturates', 'Aromatics', 'Resins', 'Asphaltenes'),
-                       nullable=False)
+    sara_type = Column(Enum(*SARA_TYPES), nullable=False)
     density = Column(Float(53))
     ref_temp_k = Column(Float(53))
 
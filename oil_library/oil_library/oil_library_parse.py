@@ -2,6 +2,8 @@
 # OilLibParse - program to parse the OilLib flat file
 #               from the ADIOS2 application
 
+from __future__ import print_function
+
 import sys
 from optparse import OptionParser
 
@@ -40,7 +42,7 @@ class OilLibraryFile(object):
             right now we are just checking for adios
             specific fields.
         '''
-        print 'checking version header:', self.__version__
+        print('checking version header:', self.__version__)
         if len(self.__version__) != 3:
             raise Exception('Bad file header: did not find 3 fields '
                             'for version!!')
@@ -68,10 +70,17 @@ class OilLibraryFile(object):
         return self._parse_row(self.fileobj.readline())
 
     def readlines(self):
-        while True:
-            line = self.readline()
-            if len(line) > 0:
-                yield line
+        return iter(self)
+
+    def __iter__(self):
+        '''
+            Lazily yield our parsed table rows, one at a time, until we
+            reach the end of the file or an empty line.
+        '''
+        for line in self.fileobj:
+            row = self._parse_row(line)
+            if len(row) > 0:
+                yield row
             else:
                 break
 
@@ -108,41 +117,41 @@ Required:
         filename = args[0]
 
     if options.verbose:
-        print 'opening:', (filename,)
+        print('opening:', (filename,))
     fd = OilLibraryFile(filename)
     if options.verbose:
-        print fd.__version__
+        print(fd.__version__)
 
-    for r in fd.readlines():
+    for r in fd:
         matchingFields = []
 
         if options.verbose:
-            print '-' * 50
-            print ('Number of Fields/Header Columns: '
-                   '{0}/{1}'.format(len(r), fd.num_columns))
+            print('-' * 50)
+            print('Number of Fields/Header Columns: '
+                  '{0}/{1}'.format(len(r), fd.num_columns))
 
         if options.fields:
             fields = options.fields.split(',')
             matchingFields = set(fields).intersection(fd.file_columns)
             if options.verbose:
-                print 'fields specified:', fields
-                print 'fields matching columns:', matchingFields
+                print('fields specified:', fields)
+                print('fields matching columns:', matchingFields)
 
         if options.raw:
-            print '\t%s' % (r,)
+            print('\t%s' % (r,))
         elif len(matchingFields) > 0:
             # we just display the fields we want
             for f in matchingFields:
-                print '\t%-20s\t%s' % (f + ':', (r[fd.file_columns_lu[f]],))
+                print('\t%-20s\t%s' % (f + ':', (r[fd.file_columns_lu[f]],)))
         else:
             # we display all fields
             for f, i in zip(r, range(len(r))):
                 if i < fd.num_columns:
                     fieldName = fd.file_columns[i]
-                    print '\t%-20s\t%s' % (fieldName + ':', (f,))
+                    print('\t%-20s\t%s' % (fieldName + ':', (f,)))
                 else:
-                    print '\t%-20s\t%s' % ('extra field:', (f,))
+                    print('\t%-20s\t%s' % ('extra field:', (f,)))
         if options.prompt:
             sys.stdin.readline()
         else:
-            print
+            print()
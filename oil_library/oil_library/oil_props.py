@@ -11,25 +11,163 @@ object used to initialize and OilProps object
 Not sure at present if this needs to be serializable?
 '''
 import copy
-from math import log, exp
 
-from repoze.lru import lru_cache
+from functools import wraps
+
+from repoze.lru import LRUCache, lru_cache
+import numpy as np
 
 import unit_conversion as uc
 from .utilities import get_density, get_boiling_points_from_cuts, get_viscosity
 
 
+def scalar_temp_cache(maxsize=128):
+    '''
+    memoize an OilProps method of the form f(self, temp, ...) for scalar
+    temperatures only.
+
+    Each OilProps object keeps its own caches in self._temp_cache, so cached
+    values go away with the object. Temperatures are keyed exactly.
+    ndarray, list or tuple temperatures, or calls that pass an 'out' array
+    to be filled, bypass the cache and call the method directly. Cached
+    ndarrays are returned as copies so callers can modify them.
+    '''
+    def decorator(func):
+        marker = object()
+        name = func.__name__
+
+        @wraps(func)
+        def wrapper(self, temp=marker, *args, **kwargs):
+            if temp is marker:
+                return func(self, *args, **kwargs)
+
+            if (isinstance(temp, (np.ndarray, list, tuple)) or
+                    kwargs.get('out') is not None or
+                    any(isinstance(a, np.ndarray) for a in args)):
+                return func(self, temp, *args, **kwargs)
+
+            try:
+                key = (temp, args, frozenset(kwargs.items()))
+                hash(key)
+            except TypeError:
+                # temp or kwargs are not something we know how to key on
+                return func(self, temp, *args, **kwargs)
+
+            caches = self.__dict__.get('_temp_cache')
+            if caches is None:
+                caches = self._temp_cache = {}
+
+            cache = caches.get(name)
+            if cache is None:
+                cache = caches[name] = LRUCache(maxsize)
+
+            val = cache.get(key, marker)
+            if val is marker:
+                val = func(self, temp, *args, **kwargs)
+                cache.put(key, val)
+
+            if isinstance(val, np.ndarray):
+                return val.copy()
+
+            return val
+
+        return wrapper
+
+    return decorator
+
+
 def molecular_weight(bp, component):
     '''
     return the molecular weight of the pseudocomponents (mw_i) given the
     boiling points. It returns the mw_i for saturates and aromatic components
+
+    bp can be a scalar or a numpy array. The polynomial is evaluated in
+    Horner form:
+        0.04132 - 1.985e-4 * bp + 9.494e-7 * bp ** 2
+
+    Saturates and aromatics currently use the same polynomial.
+    '''
+    if component not in ('saturate', 'aromatic'):
+        raise ValueError('component must be saturate or aromatic')
+
+    return (9.494e-7 * bp - 1.985e-4) * bp + 0.04132
+
+
+def vapor_pressure_coeffs(bp):
+    '''
+    return the terms of the vapor pressure expression that depend only on
+    the boiling points bp (Kelvin) as a tuple: (C_2i, coeff)
+    '''
+    D_Zb = 0.97
+    R_cal = 1.987  # calories
+
+    D_S = 8.75 + 1.987 * np.log(bp)
+    C_2i = 0.19 * bp - 18
+
+    return C_2i, D_S * (bp - C_2i) ** 2 / (D_Zb * R_cal * bp)
+
+
+def vapor_pressure(bp, temp, atmos_pressure=101325.0, coeffs=None):
+    '''
+    return the vapor pressure (Pascals) of pseudocomponents with finite
+    boiling points bp (Kelvin) at temperature temp (Kelvin).
+
+    bp can be a scalar or a numpy array; temp must broadcast against it.
+    coeffs is the output of vapor_pressure_coeffs(bp) if already known.
+    '''
+    if coeffs is None:
+        coeffs = vapor_pressure_coeffs(bp)
+
+    C_2i, coeff = coeffs
+
+    var = 1. / (bp - C_2i) - 1. / (temp - C_2i)
+
+    return np.exp(coeff * var) * atmos_pressure
+
+
+@lru_cache(32)
+def _finite_bp_coeffs(boiling_point):
+    '''
+    boiling_point is a tuple of component boiling points. Returns the mask
+    of finite boiling points, the finite boiling points and their
+    vapor_pressure_coeffs(). These only change with the boiling points, so
+    they are computed once per set of boiling points.
+    '''
+    bp = np.asarray(boiling_point, dtype=np.float64)
+    finite = np.isfinite(bp)
+    bp = bp[finite]
+
+    return finite, bp, vapor_pressure_coeffs(bp)
+
+
+@lru_cache(32)
+def _component_mw(boiling_point):
+    '''
+    boiling_point is a tuple of component boiling points. Returns a tuple of
+    the estimated molecular weights of the components, or None if there are
+    only resins + asphaltenes. These only change with the boiling points, so
+    several OilProps made from the same oil only estimate them once.
     '''
-    if component == 'saturate':
-        mw = (0.04132 - 1.985e-4 * bp + (9.494e-7 * bp ** 2))
-    elif component == 'aromatic':
-        mw = (0.04132 - 1.985e-4 * bp + (9.494e-7 * bp ** 2))
+    bp = np.asarray(boiling_point, dtype=np.float64)
+    finite = np.isfinite(bp)
 
-    return mw
+    if not finite.any():
+        # if there are only resins + asphaltenes, unclear how to set
+        # molecular weight - we don't want an array of 'nan' values so
+        # leave it as None
+        return None
+
+    # saturates (even index) and aromatics (odd index) use the same
+    # polynomial, so compute all of them at once
+    mw = np.empty_like(bp)
+    mw[finite] = molecular_weight(bp[finite], 'saturate')
+
+    # infinite boiling points should be the case for resins + asphaltenes
+    # which are the last components, so just make the mw equal to the
+    # component with highest BP
+    mw[~finite] = mw[finite][-1]
+
+    return tuple(mw.tolist())
 
 
 class OilProps(object):
@@ -65,6 +203,9 @@ class OilProps(object):
         '''
         self._r_oil = oil_
 
+        # per object caches of scalar_temp_cache() methods
+        self._temp_cache = {}
+
         # Default format for mass components:
         # mass_fraction =
         # [m0_s, m0_a, m1_s, m1_a, ..., m_resins, m_asphaltenes]
@@ -89,25 +230,27 @@ class OilProps(object):
                     lambda self, val: setattr(self._r_oil, 'name', val))
     api = property(lambda self: self.get('api'))
 
+    _marker = object()
+
     def get(self, prop):
         'get raw oil props'
-        val = None
-        try:
-            val = getattr(self._r_oil, prop)
-        except AttributeError:
+        # getattr with a default, so the common case raises no exception
+        val = getattr(self._r_oil, prop, self._marker)
+
+        if val is self._marker:
             try:
                 val = getattr(self._r_oil.imported, prop)
-            except:
-                pass
+            except Exception:
+                val = None
 
         return val
 
-    @lru_cache(2)
+    @scalar_temp_cache()
     def get_density(self, temp=None, out=None):
         '''
         return density at a temperature
         do we want to do any unit conversions here?
-        todo: memoize function
+        scalar temperatures are memoized, see scalar_temp_cache()
 
         :param temp: temperature in Kelvin. Could be an ndarray, list or scalar
         :type temp: scalar, list, tuple or ndarray - assumes it is in Kelvin
@@ -117,11 +260,11 @@ class OilProps(object):
         else:
             return uc.convert('density', 'API', 'kg/m^3', self.api)
 
-    @lru_cache(2)
+    @scalar_temp_cache()
     def get_viscosity(self, temp=288.15, out=None):
         '''
         return viscosity at a temperature, default is viscosity at 15degC
-        todo: memoize function
+        scalar temperatures are memoized, see scalar_temp_cache()
 
         :param temp: temperature in Kelvin. Could be an ndarray, list or scalar
         :type temp: scalar, list, tuple or ndarray - assumes it is in Kelvin
@@ -144,52 +287,27 @@ class OilProps(object):
 
     def _component_mw(self):
         'estimate molecular weights of components'
-        if self.boiling_point == [float('inf')] * len(self.boiling_point):
-            # if there are only resins + asphaltenes, unclear how to set
-            # molecular weight - we don't want an array of 'nan' values so
-            # leave it as None
-            return
-
-        self.molecular_weight = [float('nan')] * self.num_components
-        # self.molecular_weight = []
-
-        for ix, bp in enumerate(self.boiling_point):
-            if bp == float('inf'):
-                # this should be the case for resins + asphaltenes so just
-                # make the mw equal to the components with highest BP
-                self.molecular_weight[ix] = self.molecular_weight[ix - 1]
-                continue
-
-            if ix % 2 == 0:
-                self.molecular_weight[ix] = molecular_weight(bp, 'saturate')
-                # self.molecular_weight.append(molecular_weight(bp, 'saturate'))
-            else:
-                # will define a different function for mw_aromatics
-                self.molecular_weight[ix] = molecular_weight(bp, 'aromatic')
-                # self.molecular_weight.append(molecular_weight(bp, 'aromatic'))
+        mw = _component_mw(tuple(self.boiling_point))
+
+        if mw is not None:
+            self.molecular_weight = list(mw)
 
-    @lru_cache(2)
+    @scalar_temp_cache()
     def vapor_pressure(self, temp, atmos_pressure=101325.0):
         '''
         water_temp and boiling point units are Kelvin
-        returns the vapor_pressure in SI units (Pascals)
-        todo: memoize function
+        returns the vapor_pressure in SI units (Pascals) as a numpy array
+        with one value per component
+
+        All components are evaluated in one vectorized expression.
+        Components with an infinite boiling point (resins + asphaltenes)
+        get a vapor pressure of 0 so the exponential decay constant is 0
+        and their mass is unchanged.
         '''
-        D_Zb = 0.97
-        R_cal = 1.987  # calories
-
-        Pi = []
-        for bp in self.boiling_point:
-            if bp == float('inf'):
-                # make the exponential decay constant 0 so mass is unchanged
-                Pi.append(0.0)
-            else:
-                D_S = 8.75 + 1.987 * log(bp)
-                C_2i = 0.19 * bp - 18
+        finite, bp, coeffs = _finite_bp_coeffs(tuple(self.boiling_point))
 
-                var = 1. / (bp - C_2i) - 1. / (temp - C_2i)
-                ln_Pi_Po = D_S * (bp - C_2i) ** 2 / (D_Zb * R_cal * bp) * var
-                Pi.append(exp(ln_Pi_Po) * atmos_pressure)
+        Pi = np.zeros(len(finite), dtype=np.float64)
+        Pi[finite] = vapor_pressure(bp, temp, atmos_pressure, coeffs)
 
         return Pi
 
@@ -205,22 +323,36 @@ class OilProps(object):
         which maybe different. To avoid comparing the sqlalchemy object that
         is part of the raw oil record, this works as follows:
 
-        1. check if self.__dict__ == other.__dict__
-        2. if above fails, then check if the tojson() for both OilProps objects
-        match. This assumes that both objects contain tojson()
+        1. check if self.__dict__ == other.__dict__, ignoring cached values
+        2. if the derived component lists differ, the objects are not equal
+        3. if both raw oil records are the same database record (same id and
+        name), the objects are equal
+        4. otherwise check if the tojson() for both OilProps objects match.
+        This assumes that both objects contain tojson()
         '''
         if type(self) != type(other):
             return False
 
-        if self.__dict__ == other.__dict__:
+        # cached values are not part of the object's state
+        if (dict(self.__dict__, _temp_cache=None) ==
+                dict(other.__dict__, _temp_cache=None)):
+            return True
+
+        if (self.mass_fraction != other.mass_fraction or
+                self.boiling_point != other.boiling_point or
+                self.molecular_weight != other.molecular_weight):
+            return False
+
+        s_oil, o_oil = self._r_oil, other._r_oil
+        s_id = getattr(s_oil, 'id', None)
+        if (s_id is not None and s_id == getattr(o_oil, 'id', None) and
+                getattr(s_oil, 'name', None) == getattr(o_oil, 'name', None)):
             return True
-        else:
-            try:
-                return self.tojson() == other.tojson()
-            except Exception:
-                return False
 
-        return False
+        try:
+            return self.tojson() == other.tojson()
+        except Exception:
+            return False
 
     def __ne__(self, other):
         return not self == other
@@ -231,16 +363,19 @@ class OilProps(object):
         to create the OilProps copy. The database record itself does not need
         to be a deepcopy - both OilProps objects can reference the same
         database record
+
+        The remaining attributes are small lists derived from _r_oil, so they
+        are copied directly rather than re-deriving them from the record.
         '''
-        c_op = self.__class__(self._r_oil)
-        if c_op != self:
-            '''
-            Attributes are currently derived from _r_oil object. Unless the
-            user changes 'mass_fractions', 'boiling_point', 'molecular_weight'
-            after initialization, the two objects should be equal
-            '''
-            for attr in c_op.__dict__:
-                if getattr(self, attr) != getattr(c_op, attr):
-                    setattr(c_op, attr,
-                            copy.deepcopy(getattr(self, attr), memo))
+        c_op = self.__class__.__new__(self.__class__)
+        memo[id(self)] = c_op
+
+        for attr, val in self.__dict__.iteritems():
+            if attr == '_r_oil':
+                c_op.__dict__[attr] = val
+            elif attr == '_temp_cache':
+                c_op.__dict__[attr] = {}
+            else:
+                c_op.__dict__[attr] = copy.deepcopy(val, memo)
+
         return c_op
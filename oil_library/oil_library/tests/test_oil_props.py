@@ -4,6 +4,7 @@ Tests for oil_props module in gnome.db.oil_library
 import copy
 
 import pytest
+import numpy as np
 import unit_conversion as uc
 
 from oil_library import get_oil_props
@@ -100,3 +101,17 @@ class TestCopy():
         # reference so changing it in 'op' doesn't effect the list in 'dcop'
         op.mass_fraction[0] = 0
         assert op.mass_fraction != dcop.mass_fraction
+
+
+def test_vapor_pressure_cache():
+    '''
+    scalar temperatures are cached per object - the cached array must not be
+    changed by callers modifying the returned array
+    '''
+    op = get_oil_props(10)
+    vp = op.vapor_pressure(288.15)
+    expected = vp.copy()
+    vp[:] = 0
+
+    assert np.all(op.vapor_pressure(288.15) == expected)
+    assert np.all(get_oil_props(10).vapor_pressure(288.15) == expected)
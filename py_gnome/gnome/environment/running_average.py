@@ -58,8 +58,7 @@ class TimeSeriesSchema(DatetimeValue2dArraySchema):
         '''
         validate running average timeseries numpy array
         '''
-        validators.no_duplicate_datetime(node, cstruct)
-        validators.ascending_datetime(node, cstruct)
+        validators.ascending_unique_datetime(node, cstruct)
 
 
 class RunningAverageSchema(base_schema.ObjType):
@@ -162,8 +162,7 @@ class Tide(Environment, Serializable):
         if isinstance(self.cy_obj, CyShioTime):
             self.cy_obj.set_shio_yeardata_path(value)
 
-    filename = property(lambda self: (self.cy_obj.filename, None
-                                      )[self.cy_obj.filename == ''])
+    filename = property(lambda self: self.cy_obj.filename or None)
 
     scale_factor = property(lambda self:
                             self.cy_obj.scale_factor, lambda self, val:
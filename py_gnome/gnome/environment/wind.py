@@ -6,6 +6,7 @@ the Wind object defines the Wind conditions for the spill
 import datetime
 import os
 import copy
+from collections import OrderedDict
 
 import numpy
 np = numpy
@@ -27,9 +28,23 @@ from gnome.persist import validators, base_schema
 
 from .environment import Environment
 from gnome.utilities.timeseries import Timeseries
+from gnome.utilities.convert import tsformat
 from .. import _valid_units
 
 
+# velocity conversions are a pure scale factor - cache the factor for each
+# (from_unit, to_unit) pair so unit_conversion is only consulted once
+_velocity_scales = {}
+
+
+def _velocity_scale(from_unit, to_unit):
+    key = (from_unit, to_unit)
+    if key not in _velocity_scales:
+        _velocity_scales[key] = uc.convert('Velocity', from_unit, to_unit, 1.0)
+
+    return _velocity_scales[key]
+
+
 class MagnitudeDirectionTuple(DefaultTupleSchema):
     speed = SchemaNode(Float(),
                        default=0,
@@ -70,8 +85,7 @@ class WindTimeSeriesSchema(DatetimeValue2dArraySchema):
         '''
         validate wind timeseries numpy array
         '''
-        validators.no_duplicate_datetime(node, cstruct)
-        validators.ascending_datetime(node, cstruct)
+        validators.ascending_unique_datetime(node, cstruct)
 
 
 class WindSchema(base_schema.ObjType):
@@ -132,8 +146,15 @@ class Wind(Timeseries, Environment, serializable.Serializable):
                       ])
     _state['name'].test_for_eq = False
 
-    # list of valid velocity units for timeseries
-    valid_vel_units = _valid_units('Velocity')
+    # set by to_serialize() while building json that doesn't use timeseries
+    _skip_timeseries = False
+
+    # max number of converted timeseries kept by get_timeseries()
+    _ts_cache_size = 4
+
+    # set of valid velocity units for timeseries - built on first use by
+    # valid_vel_units() so importing the module doesn't build it
+    _valid_vel_units = None
 
     def __init__(self, timeseries=None, units=None,
                  filename=None, format='r-theta',
@@ -150,6 +171,10 @@ class Wind(Timeseries, Environment, serializable.Serializable):
         self.description = kwargs.pop('description', 'Wind Object')
         self.speed_uncertainty_scale = speed_uncertainty_scale
 
+        # converted copies of the full timeseries keyed by (units, format),
+        # least recently used first. Cleared by set_timeseries()
+        self._ts_cache = OrderedDict()
+
         if filename is not None:
             super(Wind, self).__init__(filename=filename, format=format,
                                        **kwargs)
@@ -171,15 +196,34 @@ class Wind(Timeseries, Environment, serializable.Serializable):
 
                 self.set_timeseries(timeseries, units, format)
 
+    @classmethod
+    def valid_vel_units(cls):
+        '''
+        Returns the set of valid velocity units for timeseries
+        '''
+        if Wind._valid_vel_units is None:
+            Wind._valid_vel_units = frozenset(_valid_units('Velocity'))
+
+        return Wind._valid_vel_units
+
     def _check_units(self, units):
         '''
-        Checks the user provided units are in list Wind.valid_vel_units
+        Checks the user provided units are in set Wind.valid_vel_units()
         '''
-        if units not in Wind.valid_vel_units:
+        if units not in Wind.valid_vel_units():
             raise uc.InvalidUnitError((units, 'Velocity'))
 
+    # long timeseries are summarized by __repr__
+    _repr_max_entries = 6
+
     def __repr__(self):
-        self_ts = self.timeseries.__repr__()
+        ts = self.timeseries
+        if len(ts) > self._repr_max_entries:
+            self_ts = ('<{0} entries, first 3: {1!r}>'
+                       .format(len(ts), ts[:3]))
+        else:
+            self_ts = repr(ts)
+
         return ('{0.__class__.__module__}.{0.__class__.__name__}('
                 'description="{0.description}", '
                 'source_id="{0.source_id}", '
@@ -207,10 +251,14 @@ class Wind(Timeseries, Environment, serializable.Serializable):
             sts = self.get_timeseries(units=self.units)
             ots = other.get_timeseries(units=self.units)
 
-            if (sts['time'] != ots['time']).all():
+            if (sts.shape != ots.shape or
+                    not np.array_equal(sts['time'], ots['time'])):
                 return False
             else:
-                return np.allclose(sts['value'], ots['value'], 0, 1e-2)
+                # same as np.allclose(.., rtol=0, atol=1e-2) - with rtol=0
+                # the tolerance check reduces to one subtract and compare
+                return bool((np.abs(sts['value'] - ots['value']) <=
+                             1e-2).all())
 
         return check
 
@@ -256,18 +304,30 @@ class Wind(Timeseries, Environment, serializable.Serializable):
         self._check_units(value)
         self._user_units = value
 
+    @staticmethod
+    def _ts_format(format):
+        '''
+        resolve 'r-theta' or 'uv' to the integer basic_types.ts_format value
+        once, so it isn't looked up again by each function it is passed to
+        '''
+        if isinstance(format, basestring):
+            return tsformat(format)
+
+        return format
+
     def _convert_units(self, data, ts_format, from_unit, to_unit):
         '''
         method to convert units for the 'value' stored in the
-        date/time value pair
+        date/time value pair. ts_format is the integer defined by
+        basic_types.ts_format
         '''
         if from_unit != to_unit:
-            data[:, 0] = uc.convert('Velocity', from_unit, to_unit, data[:, 0])
+            scale = _velocity_scale(from_unit, to_unit)
+            data[:, 0] *= scale
 
             if ts_format == basic_types.ts_format.uv:
                 # TODO: avoid clobbering the 'ts_format' namespace
-                data[:, 1] = uc.convert('Velocity', from_unit, to_unit,
-                                        data[:, 1])
+                data[:, 1] *= scale
 
         return data
 
@@ -290,25 +350,44 @@ class Wind(Timeseries, Environment, serializable.Serializable):
                   'knots\n'
                   'LTime\n'
                   '0,0,0,0,0,0,0,0\n')
-        val = self.get_timeseries(units='knots')['value']
-        dt = (self.get_timeseries(units='knots')['time']
-              .astype(datetime.datetime))
-
+        row = ('{0.day:02}, '
+               '{0.month:02}, '
+               '{0.year:04}, '
+               '{0.hour:02}, '
+               '{0.minute:02}, '
+               '{1:02.4f}, {2:02.4f}\n')
+
+        # get the converted timeseries once and format all rows before
+        # writing them out in a single call
+        ts = self.get_timeseries(units='knots')
+        dt = ts['time'].astype(datetime.datetime)
+        val = ts['value']
+
+        rows = [row.format(idt, round(v[0], 4), round(v[1], 4))
+                for idt, v in zip(dt, val)]
+
+        # the with block closes the file
         with open(datafile, 'w') as file_:
-            file_.write(header)
-
-            for i, idt in enumerate(dt):
-                file_.write('{0.day:02}, '
-                            '{0.month:02}, '
-                            '{0.year:04}, '
-                            '{0.hour:02}, '
-                            '{0.minute:02}, '
-                            '{1:02.4f}, {2:02.4f}\n'
-                            .format(idt,
-                                    round(val[i, 0], 4),
-                                    round(val[i, 1], 4))
-                            )
-        file_.close()   # just incase we get issues on windows
+            file_.write(header + ''.join(rows))
+
+    def to_serialize(self, json_='webapi'):
+        '''
+        The timeseries is not part of the json for save files - save() writes
+        it to a datafile instead - so don't convert it in to_dict() just to
+        throw it away
+        '''
+        self._skip_timeseries = (json_ == 'save')
+        try:
+            return super(Wind, self).to_serialize(json_)
+        finally:
+            self._skip_timeseries = False
+
+    def timeseries_to_dict(self):
+        'used by to_dict(); returning None leaves timeseries out of the dict'
+        if self._skip_timeseries:
+            return None
+
+        return self.timeseries
 
     def update_from_dict(self, data):
         '''
@@ -348,9 +427,36 @@ class Wind(Timeseries, Environment, serializable.Serializable):
         Override this method to define the derived object's unit conversion
         functionality
         """
-        datetimeval = super(Wind, self).get_timeseries(datetime, format)
         units = (units, self._user_units)[units is None]
+        format = self._ts_format(format)
+
+        if datetime is None:
+            # return a copy since callers are free to modify the array they
+            # get back
+            return self._cached_timeseries(units, format).copy()
+
+        return self._get_converted_timeseries(datetime, units, format)
+
+    def _cached_timeseries(self, units, format):
+        '''
+        full timeseries only changes in set_timeseries() so keep the converted
+        array around. The array returned is the cached one - it must not be
+        modified.
+        '''
+        key = (units, format)
+        datetimeval = self._ts_cache.pop(key, None)
+
+        if datetimeval is None:
+            datetimeval = self._get_converted_timeseries(None, units, format)
+            if len(self._ts_cache) >= self._ts_cache_size:
+                self._ts_cache.popitem(last=False)
 
+        self._ts_cache[key] = datetimeval
+
+        return datetimeval
+
+    def _get_converted_timeseries(self, datetime, units, format):
+        datetimeval = super(Wind, self).get_timeseries(datetime, format)
         datetimeval['value'] = self._convert_units(datetimeval['value'],
                                                    format,
                                                    'meter per second',
@@ -370,7 +476,7 @@ class Wind(Timeseries, Environment, serializable.Serializable):
         :type datetime_value_2d: numpy array of dtype
                                  basic_types.datetime_value_2d
         :param units: units associated with the data. Valid units defined in
-                      Wind.valid_vel_units list
+                      Wind.valid_vel_units() set
         :param format: output format for the times series; as defined by
                        basic_types.format.
         :type format: either string or integer value defined by
@@ -378,11 +484,13 @@ class Wind(Timeseries, Environment, serializable.Serializable):
         """
         self._check_units(units)
         self.units = units
+        format = self._ts_format(format)
         datetime_value_2d = self._xform_input_timeseries(datetime_value_2d)
         datetime_value_2d['value'] = \
             self._convert_units(datetime_value_2d['value'],
                                 format, units, 'meter per second')
         super(Wind, self).set_timeseries(datetime_value_2d, format)
+        self._ts_cache.clear()
 
     def get_value(self, time):
         '''
@@ -395,10 +503,24 @@ class Wind(Timeseries, Environment, serializable.Serializable):
         :param time: the time(s) you want the data for
         :type time: datetime object or sequence of datetime objects.
 
+        :returns: (speed, direction) tuple for a single time. For a sequence
+            of times, a (N, 2) array with one (speed, direction) row per time
+            - all times are interpolated in one call.
+
         .. note:: It invokes get_timeseries(..) function
         '''
+        if np.ndim(time) == 0:
+            ts = self._cached_timeseries('m/s', basic_types.ts_format.r_theta)
+            if len(ts) == 1:
+                # constant wind, like the ones made by constant_wind(), has
+                # the same value at all times - no need to interpolate
+                return tuple(ts[0]['value'])
+
+            data = self.get_timeseries(time, 'm/s', 'r-theta')
+            return tuple(data[0]['value'])
+
         data = self.get_timeseries(time, 'm/s', 'r-theta')
-        return tuple(data[0]['value'])
+        return data['value']
 
     def set_speed_uncertainty(self, up_or_down=None):
         '''
@@ -430,16 +552,16 @@ class Wind(Timeseries, Environment, serializable.Serializable):
         else:
             percent_uncertainty = self.speed_uncertainty_scale
 
-        time_series = self.get_timeseries()
+        if up_or_down == 'up':
+            f = 0.5 + percent_uncertainty
+        else:
+            f = 0.5 - percent_uncertainty
 
-        for tse in time_series:
-            sigma = rayleigh.sigma_from_wind(tse['value'][0])
-            if up_or_down == 'up':
-                tse['value'][0] = rayleigh.quantile(0.5 + percent_uncertainty,
-                                                    sigma)
-            elif up_or_down == 'down':
-                tse['value'][0] = rayleigh.quantile(0.5 - percent_uncertainty,
-                                                    sigma)
+        # RayleighDistribution methods are numpy expressions, so shift all
+        # the speeds at once
+        time_series = self.get_timeseries()
+        sigma = rayleigh.sigma_from_wind(time_series['value'][:, 0])
+        time_series['value'][:, 0] = rayleigh.quantile(f, sigma)
 
         self.set_timeseries(time_series, self.units)
 
@@ -3,9 +3,8 @@ Weathering Outputter
 '''
 import copy
 import os
-from glob import glob
 
-from geojson import dump
+from geojson import dumps
 from colander import SchemaNode, String, drop
 
 from gnome.utilities.serializable import Serializable, Field
@@ -75,15 +74,9 @@ class WeatheringOutput(Outputter, Serializable):
         # return a dict - json of the weathering_data data
         for sc in self.cache.load_timestep(step_num).items():
             # Not capturing 'uncertain' info yet
-            # dict_ = {'uncertain': sc.uncertain}
-            dict_ = {}
-
-            for key, val in sc.weathering_data.iteritems():
-                dict_[key] = val
-
             output_info = {'step_num': step_num,
                            'time_stamp': sc.current_time_stamp.isoformat()}
-            output_info.update(dict_)
+            output_info.update(sc.weathering_data)
 
             if self.output_dir:
                 output_filename = self.output_to_file(output_info, step_num)
@@ -96,17 +89,20 @@ class WeatheringOutput(Outputter, Serializable):
         filename = os.path.join(self.output_dir,
                                 file_format.format(step_num))
 
+        # encode to a string first - dump() writes each encoded chunk to the
+        # file separately
         with open(filename, 'w') as outfile:
-            dump(json_content, outfile, indent=True)
+            outfile.write(dumps(json_content, indent=True))
 
         return filename
 
     def clean_output_files(self):
-        if self.output_dir:
-            files = glob(os.path.join(self.output_dir,
-                                      'weathering_data_*.json'))
-            for f in files:
-                os.remove(f)
+        if self.output_dir and os.path.isdir(self.output_dir):
+            # plain prefix/suffix checks - no need for glob's pattern matching
+            for name in os.listdir(self.output_dir):
+                if (name.startswith('weathering_data_') and
+                        name.endswith('.json')):
+                    os.remove(os.path.join(self.output_dir, name))
 
     def rewind(self):
         'remove previously written files'
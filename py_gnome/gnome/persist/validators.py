@@ -62,6 +62,34 @@ def ascending_datetime(node, values):
                       'ascending order')
 
 
+def ascending_unique_datetime(node, values):
+    """
+    Combines no_duplicate_datetime() and ascending_datetime() for numpy
+    structured arrays like datetime_value_2d. A single pass over the time
+    differences validates the common case - ascending, unique times.
+    """
+    try:
+        diff = np.diff(values['time'])
+    except AttributeError:
+        return
+
+    zero = np.timedelta64(0)
+
+    if np.any(diff < zero):
+        # report duplicates first, like the separate validators do
+        no_duplicate_datetime(node, values)
+        raise Invalid(node,
+                      'The datetime values in the timeseries must be in '
+                      'ascending order')
+
+    num_dups = np.count_nonzero(diff == zero)
+
+    if num_dups:
+        raise Invalid(node,
+                      'Duplicate time entries are not allowed. '
+                      'Found {0} duplicates.'.format(num_dups))
+
+
 #==============================================================================
 # def degrees_true(node, direction):
 #    if 0 > direction > 360:
@@ -55,6 +55,17 @@ class SpillContainerData(object):
 
     Designed primarily to hold data retrieved from cache
     """
+    # attributes that are just other views of the data - __eq__ skips these
+    _derived_attrs = ('_substances_spills',
+                      '_n_substances',
+                      '_has_multi_substance',
+                      '_substance_indices',
+                      '_fixed_atypes',
+                      '_weather_atypes',
+                      '_buffers',
+                      '_scratch_bool',
+                      '_spill_index')
+
     def __init__(self, data_arrays=None, uncertain=False):
         """
         Initialize a SimpleSpillContainer.
@@ -121,15 +132,20 @@ class SpillContainerData(object):
         data_arrays can be modified.
         All data_arrays are defined in prepare_for_model_run
         """
+        existing = self._data_arrays.get(data_name)
+        if array is existing:
+            # array was modified in place - nothing to check or set
+            return
+
         array = np.asarray(array)
 
-        if data_name in self._data_arrays:
+        if existing is not None:
             # if the array is already here, the type should match
-            if array.dtype != self._data_arrays[data_name].dtype:
+            if array.dtype != existing.dtype:
                 raise ValueError('new data array must be the same type')
 
             # and the shape should match
-            if array.shape != self._data_arrays[data_name].shape:
+            if array.shape != existing.shape:
                 msg = 'data array must be the same shape as original array'
                 raise ValueError(msg)
         else:
@@ -158,26 +174,36 @@ class SpillContainerData(object):
         val_is_dict = []
         for key, val in self.__dict__.iteritems():
             'compare dict not including _data_arrays'
-            if isinstance(val, dict):
-                val_is_dict.append(key)
-            elif key == '_substances_spills':
+            if key in self._derived_attrs:
                 '''
-                this is just another view of the data - no need to write extra
-                code to check equality for this
+                these are just other views of the data - no need to write
+                extra code to check equality for these
                 '''
                 pass
+            elif isinstance(val, dict):
+                val_is_dict.append(key)
             elif val != other.__dict__[key]:
                 return False
 
         # check key, val that are dicts
         for item in val_is_dict:
-            if set(self.__dict__[item]) != set(other.__dict__[item]):
+            if (self.__dict__[item].viewkeys() !=
+                    other.__dict__[item].viewkeys()):
                 # dicts should contain the same keys
                 return False
 
             for key, val in self.__dict__[item].iteritems():
                 other_val = other.__dict__[item][key]
                 if isinstance(val, np.ndarray):
+                    if val is other_val:
+                        continue
+
+                    if self._array_allclose_atol == 0:
+                        # arrays must match exactly
+                        if not np.array_equal(val, other_val):
+                            return False
+                        continue
+
                     try:
                         if not np.allclose(val, other_val, 0,
                                            self._array_allclose_atol):
@@ -203,9 +229,14 @@ class SpillContainerData(object):
         SpillContainer.
         """
         try:
+            # all elements have 'positions' - use it instead of creating an
+            # iterator to get an arbitrary first array
+            return len(self._data_arrays['positions'])
+        except KeyError:
             # find the length of an arbitrary first array
-            return len(self._data_arrays.itervalues().next())
-        except StopIteration:
+            for arr in self._data_arrays.itervalues():
+                return len(arr)
+
             return 0
 
     @property
@@ -241,11 +272,21 @@ class SpillContainer(AddLogger, SpillContainerData):
     positions = spill_container['positions'] : returns a (num_LEs, 3) array of
     world_point_types
     """
+    # number of elements the data array buffers are first allocated for
+    _initial_capacity = 1024
+
     def __init__(self, uncertain=False):
         super(SpillContainer, self).__init__(uncertain=uncertain)
         self.spills = OrderedCollection(dtype=gnome.spill.Spill)
         self.spills.register_callback(self._spills_changed,
                                       ('add', 'replace', 'remove'))
+
+        # maps spill.id to index of spill in self.spills - see _spill_num()
+        self._spill_index = None
+
+        # capacity buffers the data arrays are views into - these are kept
+        # on rewind so the next run reuses them
+        self._buffers = {}
         self.rewind()
 
         # don't want user to add to array_types in middle of run. Since its
@@ -258,6 +299,9 @@ class SpillContainer(AddLogger, SpillContainerData):
         # Initialize following either the first time it is used or in
         # prepare_for_model_run() -- it could change with each new spill
         self._substances_spills = None
+        self._n_substances = None
+        self._has_multi_substance = None
+        self._substance_indices = None
         self._oil_comp_array_len = None
 
     def __setitem__(self, data_name, array):
@@ -272,6 +316,7 @@ class SpillContainer(AddLogger, SpillContainerData):
             dtype = self._data_arrays[data_name].dtype.type
 
             self._array_types[data_name] = ArrayType(shape, dtype)
+            self._fixed_atypes = None
 
     def _reset_arrays(self):
         '''
@@ -288,7 +333,15 @@ class SpillContainer(AddLogger, SpillContainerData):
                              'mass': mass,
                              'age': age}
         self._data_arrays = {}
+        self._scratch_bool = None
+
+        # _array_types split by _partition_array_types()
+        self._fixed_atypes = None
+        self._weather_atypes = None
         self._substances_spills = None
+        self._n_substances = None
+        self._has_multi_substance = None
+        self._substance_indices = None
 
         # reset following since arrays are reset
         self._oil_comp_array_len = None
@@ -339,17 +392,23 @@ class SpillContainer(AddLogger, SpillContainerData):
         # define the substances list and the list of spills for each substance
         self._substances_spills = substances_spills(substances=subs,
                                                     spills=spills,
-                                                    data=[{}] * len(subs))
+                                                    data=[{} for s in subs])
+
+        # cache these since they are checked each time elements are released
+        # or weatherers get/set the substance data
+        self._n_substances = len(subs)
+        self._has_multi_substance = self._n_substances > 1
 
-        if len(self.get_substances()) > 1:
+        if self._has_multi_substance:
             # add an arraytype for substance if more than one substance
             self._array_types.update({'substance': substance})
-        elif len(self.get_substances()) == 1:
+            self._fixed_atypes = None
+        elif self._n_substances == 1:
             # only one substance so reference the _data_arrays dict directly
             self._substances_spills.data[0] = self._data_arrays
 
         self.logger.info('{0} - number of substances: {1}'.
-                         format(os.getpid(), len(self.get_substances())))
+                         format(os.getpid(), self._n_substances))
 
     def _update_substance_array_reset_data(self,
                                            subs_idx,
@@ -367,10 +426,19 @@ class SpillContainer(AddLogger, SpillContainerData):
             If there is only one substance in _substances_spills
             structure, then do nothing.
         '''
-        if len(self.get_substances()) > 1:
+        if self._has_multi_substance:
             if num_rel_by_substance > 0:
-                self['substance'][-num_rel_by_substance:] = subs_idx
+                num = len(self)
+                first = num - num_rel_by_substance
+                self._data_arrays['substance'][first:num].fill(subs_idx)
 
+                if self._substance_indices is not None:
+                    self._substance_indices[subs_idx] = \
+                        np.concatenate((self._substance_indices[subs_idx],
+                                        np.arange(first, num)))
+
+            # reset even if nothing was released - movers change the
+            # data_arrays every step so the copy is stale
             self._substances_spills.data[subs_idx] = {}
 
     def _spills_changed(self, *args):
@@ -380,6 +448,26 @@ class SpillContainer(AddLogger, SpillContainerData):
         since the old _substance_spills value could now be invalid.
         '''
         self._substances_spills = None
+        self._n_substances = None
+        self._has_multi_substance = None
+        self._substance_indices = None
+        self._spill_index = None
+
+    def _spill_num(self, spill):
+        '''
+        return the index of spill in self.spills. This is the 'spill_num' of
+        its elements. OrderedCollection.index() sorts the indices of all
+        spills each time so keep a dict that is reset by _spills_changed
+        '''
+        if self._spill_index is None:
+            self._spill_index = dict((sp.id, ix)
+                                     for (ix, sp) in enumerate(self.spills))
+
+        try:
+            return self._spill_index[spill.id]
+        except KeyError:
+            # not one of our spills - let OrderedCollection raise the error
+            return self.spills.index(spill)
 
     def _index_of_substance(self, substance):
         try:
@@ -401,7 +489,7 @@ class SpillContainer(AddLogger, SpillContainerData):
         if ix is None:
             return
 
-        if len(self.get_substances()) > 1:
+        if self._has_multi_substance:
             self._set_substancedata(arrays)
 
         return self._substances_spills.data[ix]
@@ -433,11 +521,12 @@ class SpillContainer(AddLogger, SpillContainerData):
         if self._substances_spills is None:
             self._set_substancespills()
 
-        if len(self.get_substances()) > 1:
+        if self._has_multi_substance:
             self._set_substancedata(arrays)
-        return filter(lambda x: x[0] is not None,
-                      zip(self._substances_spills.substances,
-                          self._substances_spills.data))
+        return [(subs, data) for (subs, data)
+                in zip(self._substances_spills.substances,
+                       self._substances_spills.data)
+                if subs is not None]
 
     def update_from_substancedata(self, arrays, substance=None):
         '''
@@ -445,7 +534,10 @@ class SpillContainer(AddLogger, SpillContainerData):
         only update if a copy of 'data' exists. This is the case if there are
         more then one substances
         '''
-        if len(self.get_substances()) == 1:
+        if self._substances_spills is None:
+            self._set_substancespills()
+
+        if not self._has_multi_substance:
             return
         if substance is None:
             self._update_all_from_substancedata(arrays)
@@ -454,16 +546,16 @@ class SpillContainer(AddLogger, SpillContainerData):
             if ix is None:
                 return
             data = self._substances_spills.data[ix]
-            mask = self['substance'] == ix
+            idx = self._substance_index(ix)
             for array in arrays:
-                self[array][mask] = data[array][:]
+                self._data_arrays[array][idx] = data[array]
 
     def _update_all_from_substancedata(self, arrays):
         for ix, data in enumerate(self._substances_spills.data):
             if self._substances_spills.substances[ix] is not None:
-                mask = self['substance'] == ix
+                idx = self._substance_index(ix)
                 for array in arrays:
-                    self[array][mask] = data[array][:]
+                    self._data_arrays[array][idx] = data[array]
 
     def _set_substancedata(self, arrays):
         '''
@@ -475,10 +567,26 @@ class SpillContainer(AddLogger, SpillContainerData):
             if self._substances_spills.substances[ix] is None:
                 continue
 
-            mask = self['substance'] == ix
+            idx = self._substance_index(ix)
             for array in arrays:
                 if array not in data:
-                    data[array] = self[array][mask]
+                    data[array] = np.take(self._data_arrays[array], idx,
+                                          axis=0)
+
+    def _substance_index(self, ix):
+        '''
+        return the indices of the elements of substance 'ix' in the data
+        arrays. The indices of all substances are found from the 'substance'
+        array the first time they're needed. After that, they're updated as
+        elements are released and removed instead of scanning the 'substance'
+        array each time.
+        '''
+        if self._substance_indices is None:
+            subs = self['substance']
+            self._substance_indices = [np.flatnonzero(subs == i)
+                                       for i in xrange(self._n_substances)]
+
+        return self._substance_indices[ix]
 
     def get_substances(self, complete=True):
         '''
@@ -491,7 +599,8 @@ class SpillContainer(AddLogger, SpillContainerData):
         if complete:
             return self._substances_spills.substances
         else:
-            return filter(None, self._substances_spills.substances)
+            return [subs for subs in self._substances_spills.substances
+                    if subs is not None]
 
     @property
     def array_types(self):
@@ -528,7 +637,7 @@ class SpillContainer(AddLogger, SpillContainerData):
         self.logger.info('{0} - rewound SpillContainer'.format(os.getpid()))
 
     def get_spill_mask(self, spill):
-        return self['spill_num'] == self.spills.index(spill)
+        return self['spill_num'] == self._spill_num(spill)
 
     def uncertain_copy(self):
         """
@@ -596,15 +705,62 @@ class SpillContainer(AddLogger, SpillContainerData):
         initialize_data_arrays() is called without input data during rewind
         and prepare_for_model_run to define all data arrays.
         At this time the arrays are empty.
+
+        This also splits the _array_types into the lists used by
+        _append_data_arrays() so they are iterated directly instead of the
+        dict.
         """
+        self._partition_array_types()
+
+        # data arrays are emptied, so are the element indices per substance
+        self._substance_indices = None
+
+        # Initialize data_arrays with 0 elements
+        for name, initialize in self._fixed_atypes:
+            self._data_arrays[name] = self._reuse_buffer(name, initialize(0))
+
+        num_comp = self._oil_comp_array_len
+        for name in self._weather_atypes:
+            self._data_arrays[name] = self._reuse_buffer(
+                name,
+                self._array_types[name].initialize_null(shape=(num_comp, )))
+
+        # drop buffers for arrays that are no longer used
+        for name in self._buffers.keys():
+            if name not in self._array_types:
+                del self._buffers[name]
+
+    def _reuse_buffer(self, name, arr):
+        '''
+        If the buffer for data array 'name' from a previous run holds
+        elements of the same dtype and shape as the empty array arr, return
+        an empty view of it so elements released in this run are appended
+        to it instead of growing a new buffer. Otherwise drop the buffer and
+        return arr.
+        '''
+        buf = self._buffers.get(name)
+        if (buf is not None and
+                buf.dtype == arr.dtype and buf.shape[1:] == arr.shape[1:]):
+            return buf[:0]
+
+        self._buffers.pop(name, None)
+        return arr
+
+    def _partition_array_types(self):
+        '''
+        split _array_types into a list of (name, initialize) for the arrays
+        with a fixed shape and a list of names of the weathering arrays,
+        whose shape is None and set by the number of oil components. Done in
+        initialize_data_arrays() and again whenever _array_types changes
+        instead of checking each ArrayType every time elements are released.
+        '''
+        self._fixed_atypes = []
+        self._weather_atypes = []
         for name, atype in self._array_types.iteritems():
-            # Initialize data_arrays with 0 elements
             if atype.shape is None:
-                num_comp = self._oil_comp_array_len
-                self._data_arrays[name] = \
-                    atype.initialize_null(shape=(num_comp, ))
+                self._weather_atypes.append(name)
             else:
-                self._data_arrays[name] = atype.initialize_null()
+                self._fixed_atypes.append((name, atype.initialize))
 
     def _append_data_arrays(self, num_released):
         """
@@ -614,19 +770,57 @@ class SpillContainer(AddLogger, SpillContainerData):
         :param int num_released: number of particles released
 
         """
-        for name, atype in self._array_types.iteritems():
-            # initialize all arrays even if 0 length
-            if atype.shape is None:
-                # assume array type is for weather data, provide it the shape
-                # per the number of components used to model the oil
-                # currently, we only have one type of oil, so all spills will
-                # model same number of oil_components
-                a_append = atype.initialize(num_released,
-                                            shape=(self._oil_comp_array_len,),
-                                            initial_value=tuple([0] * self._oil_comp_array_len))
-            else:
-                a_append = atype.initialize(num_released)
-            self._data_arrays[name] = np.r_[self._data_arrays[name], a_append]
+        if self._fixed_atypes is None:
+            self._partition_array_types()
+
+        append_to_buffer = self._append_to_buffer
+        data_arrays = self._data_arrays
+
+        # initialize all arrays even if 0 length
+        for name, initialize in self._fixed_atypes:
+            data_arrays[name] = append_to_buffer(name, num_released,
+                                                 initialize(num_released))
+
+        # the weather data arrays were initialized with the shape per the
+        # number of components used to model the oil. These always start at 0
+        # so fill the new elements in the buffer with 0 directly instead of
+        # creating an array of zeros to copy from.
+        # currently, we only have one type of oil, so all spills will model
+        # same number of oil_components
+        for name in self._weather_atypes:
+            data_arrays[name] = append_to_buffer(name, num_released, 0)
+
+    def _append_to_buffer(self, name, num_released, values):
+        '''
+        The data arrays are views into larger buffers kept in self._buffers.
+        Append num_released elements set to values to the buffer for data
+        array 'name' and return the view of the buffer that contains all the
+        elements. values is either an array of num_released elements or a
+        scalar.
+
+        The existing elements are only copied when the buffer is full. It
+        then grows to at least twice its size so appending elements at each
+        step isn't an O(N) copy. If the data array is not a view into its
+        buffer, for instance it was replaced using __setitem__, then a new
+        buffer is created.
+        '''
+        arr = self._data_arrays[name]
+        buf = self._buffers.get(name)
+        num_old = len(arr)
+        num_new = num_old + num_released
+
+        if buf is None or arr.base is not buf or len(buf) < num_new:
+            capacity = max(num_new, self._initial_capacity)
+            if buf is not None:
+                capacity = max(capacity, 2 * len(buf))
+
+            buf = np.empty((capacity,) + arr.shape[1:], dtype=arr.dtype)
+            buf[:num_old] = arr
+            self._buffers[name] = buf
+
+        buf[num_old:num_new] = values
+
+        return buf[:num_new]
 
     def release_elements(self, time_step, model_time):
         """
@@ -646,43 +840,58 @@ class SpillContainer(AddLogger, SpillContainerData):
         # Simpler to define it only in SpillContainer as opposed to ArrayTypes
         # 'substance': ((), np.uint8, 0)
         for ix, spills in enumerate(self.iterspillsbysubstance()):
-            num_rel_by_substance = 0
+            # find the number of elements released by each spill first so
+            # the data arrays are appended to only once for the substance
+            release_plan = []
             for spill in spills:
                 if not spill.on:
                     continue
 
                 num_rel = spill.num_elements_to_release(model_time, time_step)
                 if num_rel > 0:
-                    # update 'spill_num' ArrayType's initial_value so it
-                    # corresponds with spill number for this set of released
-                    # particles - just another way to set value of spill_num
-                    # correctly
-                    self._array_types['spill_num'].initial_value = \
-                        self.spills.index(spill)
-
-                    if len(self['spill_num']) > 0:
-                        # unique identifier for each new element released
-                        # this adjusts the _array_types initial_value since the
-                        # initialize function just calls:
-                        #  range(initial_value, num_released + initial_value)
-                        self._array_types['id'].initial_value = \
-                            self['id'][-1] + 1
-                    else:
-                        # always reset value of first particle released to 0!
-                        # The array_types are shared globally. To initialize
-                        # uncertain spills correctly, reset this to 0.
-                        # To be safe, always reset to 0 when no
-                        # particles are released
-                        self._array_types['id'].initial_value = 0
-
-                    # append to data arrays - number of oil components is
-                    # currently the same for all spills
-                    self._append_data_arrays(num_rel)
+                    release_plan.append((spill, num_rel))
+
+            num_rel_by_substance = sum(num_rel for (spill, num_rel)
+                                       in release_plan)
+
+            if num_rel_by_substance > 0:
+                if len(self['spill_num']) > 0:
+                    # unique identifier for each new element released
+                    # this adjusts the _array_types initial_value since the
+                    # initialize function just calls:
+                    #  range(initial_value, num_released + initial_value)
+                    self._array_types['id'].initial_value = \
+                        self['id'][-1] + 1
+                else:
+                    # always reset value of first particle released to 0!
+                    # The array_types are shared globally. To initialize
+                    # uncertain spills correctly, reset this to 0.
+                    # To be safe, always reset to 0 when no
+                    # particles are released
+                    self._array_types['id'].initial_value = 0
+
+                # append to data arrays - number of oil components is
+                # currently the same for all spills
+                self._append_data_arrays(num_rel_by_substance)
+
+                # each spill sets the values for its own block of the newly
+                # released elements. The blocks are views into the data
+                # arrays so nothing is copied
+                # (name, array) pairs for the arrays are only listed once
+                # for all the spills
+                first = len(self) - num_rel_by_substance
+                arrays = self._data_arrays.items()
+                for spill, num_rel in release_plan:
+                    last = first + num_rel
+                    block = dict((name, arr[first:last])
+                                 for (name, arr) in arrays)
+                    block['spill_num'][:] = self._spill_num(spill)
+
                     spill.set_newparticle_values(num_rel,
                                                  model_time,
                                                  time_step,
-                                                 self._data_arrays)
-                    num_rel_by_substance += num_rel
+                                                 block)
+                    first = last
 
             # always reset data arrays else the changing arrays are stale
             self._update_substance_array_reset_data(ix, num_rel_by_substance)
@@ -694,8 +903,11 @@ class SpillContainer(AddLogger, SpillContainerData):
 
     def _reset_substances_spills_data(self, to_be_removed):
         'reset copies of data if elements are removed'
-        if len(self.get_substances()) > 1:
-            subs_idx = np.unique(self['substances'][to_be_removed])
+        if self._substances_spills is None:
+            self._set_substancespills()
+
+        if self._has_multi_substance:
+            subs_idx = np.unique(self['substance'][to_be_removed])
             for ix in subs_idx:
                 self._substances_spills.data[ix] = {}
 
@@ -703,18 +915,47 @@ class SpillContainer(AddLogger, SpillContainerData):
         '''
         Called at the end of a time step
         Need to remove particles marked as to_be_removed...
+
+        The elements that are kept are moved to the front of each data array
+        in place and the data array is truncated, so no new arrays are
+        allocated.
         '''
         if len(self._data_arrays) == 0:
             return  # nothing to do - arrays are not yet defined.
 
-        to_be_removed = np.where(self['status_codes'] ==
-                                 oil_status.to_be_removed)[0]
+        keep = np.not_equal(self['status_codes'], oil_status.to_be_removed,
+                            out=self._bool_scratch(len(self)))
+        if keep.all():
+            return
+
+        self._reset_substances_spills_data(~keep)
+
+        if self._substance_indices is not None:
+            # index of each element after the removed elements are deleted
+            new_idx = np.cumsum(keep) - 1
+            self._substance_indices = [new_idx[idx[keep[idx]]]
+                                       for idx in self._substance_indices]
+
+        # elements before the first one that is removed are already in place
+        # so only the elements after it are moved
+        first = np.argmin(keep)
+        move_idx = np.flatnonzero(keep[first:]) + first
+        num_keep = first + len(move_idx)
+        for key, arr in self._data_arrays.items():
+            arr[first:num_keep] = arr[move_idx]
+            self._data_arrays[key] = arr[:num_keep]
+
+    def _bool_scratch(self, num):
+        '''
+        return a boolean array of length num to use for a temporary mask.
+        The same buffer is returned each time and only reallocated when it
+        is too small, so the mask is only valid until the next call.
+        '''
+        if self._scratch_bool is None or len(self._scratch_bool) < num:
+            self._scratch_bool = np.empty((max(num, self._initial_capacity),),
+                                          dtype=bool)
 
-        if len(to_be_removed) > 0:
-            for key in self._array_types.keys():
-                self._reset_substances_spills_data(to_be_removed)
-                self._data_arrays[key] = np.delete(self[key], to_be_removed,
-                                                   axis=0)
+        return self._scratch_bool[:num]
 
     def __str__(self):
         return ('gnome.spill_container.SpillContainer\n'
@@ -808,8 +1049,16 @@ class SpillContainerPairData(object):
         if self.uncertain != other.uncertain:
             return False
 
-        for sc in zip(self.items(), other.items()):
-            if sc[0] != sc[1]:
+        pairs = zip(self.items(), other.items())
+
+        # cheap check first - containers holding a different number of
+        # elements are not equal so don't compare all their data arrays
+        for sc, other_sc in pairs:
+            if len(sc) != len(other_sc):
+                return False
+
+        for sc, other_sc in pairs:
+            if sc != other_sc:
                 return False
 
         return True
@@ -959,7 +1208,7 @@ class SpillContainerPair(SpillContainerPairData):
     def __iter__(self):
         'iterates over the spills defined in spill_container'
         for sp in self._spill_container.spills:
-            yield self.__getitem__(sp.id)
+            yield sp
 
     def __len__(self):
         '''
@@ -1012,9 +1261,13 @@ class SpillContainerPair(SpillContainerPairData):
         updated = False
         if len(l_spills) != len(self):
             updated = True
-
-        if self._spill_container.spills.values() != l_spills:
-            updated = True
+        else:
+            # spills that are the same objects are equal - only use __eq__
+            # for spills that were replaced and stop at the first difference
+            for spill, l_spill in zip(self._spill_container.spills, l_spills):
+                if spill is not l_spill and spill != l_spill:
+                    updated = True
+                    break
 
         if updated:
             self.clear()
@@ -1038,7 +1291,13 @@ class SpillContainerPair(SpillContainerPairData):
         '''
         try:
             return self._spill_container.spills.index(spill)
-        except:
+        except ValueError:
+            # OrderedCollection.index() raises ValueError for a spill or spill
+            # id it doesn't hold - only uncertain pairs have a second place
+            # to look
+            if not self.uncertain:
+                raise
+
             return self._u_spill_container.spills.index(spill)
 
     @property
@@ -8,6 +8,15 @@ from gnome import basic_types
 import numpy as np
 
 
+def _has_dtype(array, dtype):
+    '''
+    check the dtype of the array. Arrays created with one of the
+    basic_types dtypes share the same dtype object, so check identity before
+    falling back on the slower structured dtype comparison
+    '''
+    return array.dtype is dtype or array.dtype == dtype
+
+
 def to_time_value_pair(datetime_value, in_ts_format=None):
     """
     converts a numpy array containing basic_types.datetime_value_2d in
@@ -24,8 +33,11 @@ def to_time_value_pair(datetime_value, in_ts_format=None):
         given in basic_types.ts_format.
     """
 
-    if(datetime_value.dtype != basic_types.datetime_value_2d and
-        datetime_value.dtype != basic_types.datetime_value_1d):
+    is_2d = _has_dtype(datetime_value, basic_types.datetime_value_2d)
+    is_1d = (not is_2d and
+             _has_dtype(datetime_value, basic_types.datetime_value_1d))
+
+    if not (is_2d or is_1d):
         raise ValueError('Method expects a numpy array containing '
             'basic_types.datetime_value_2d or basic_types.datetime_value_1d')
 
@@ -36,7 +48,7 @@ def to_time_value_pair(datetime_value, in_ts_format=None):
 
     time_value_pair['time'] = \
             time_utils.date_to_sec(datetime_value['time'])
-    if datetime_value.dtype == basic_types.datetime_value_1d:
+    if is_1d:
         time_value_pair['value']['u'] = datetime_value['value'][:, 0]
 
     else:
@@ -74,7 +86,7 @@ def to_datetime_value_2d(time_value_pair, out_ts_format):
                           options given in basic_types.ts_format
     """
 
-    if time_value_pair.dtype != basic_types.time_value_pair:
+    if not _has_dtype(time_value_pair, basic_types.time_value_pair):
         raise ValueError('Method expects a numpy array containing basic_types.time_value_pair'
                          )
 
@@ -126,7 +138,7 @@ def to_datetime_value_1d(time_value_pair):
 
     :param time_value_pair: numpy array of type basic_types.time_value_pair
     '''
-    if time_value_pair.dtype != basic_types.time_value_pair:
+    if not _has_dtype(time_value_pair, basic_types.time_value_pair):
         raise ValueError('Method expects a numpy array containing '
             'basic_types.time_value_pair')
 
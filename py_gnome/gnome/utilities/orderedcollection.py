@@ -178,7 +178,7 @@ class OrderedCollection(object):
         return sorted(self._d_index.values()).index(idx)
 
     def __len__(self):
-        return len(self._d_index.keys())
+        return len(self._d_index)
 
     def __iter__(self):
         for i in sorted(self._d_index.values()):
@@ -28,13 +28,19 @@ def date_to_sec(date_time):
     """
 
     d_array = np.asarray(date_time, dtype='datetime64[s]').reshape(-1)
-    t_array = np.zeros(np.shape(d_array), dtype=np.uint32)
 
-    for li in xrange(len(d_array)):
-        date = d_array[li].astype(object)
+    # mktime is only called once per distinct date - requests for many
+    # values at the same model time are common
+    u_dates, inverse = np.unique(d_array, return_inverse=True)
+    u_secs = np.zeros(np.shape(u_dates), dtype=np.uint32)
+
+    for li in xrange(len(u_dates)):
+        date = u_dates[li].astype(object)
         temp = list(date.timetuple())
         temp[-1] = 0
-        t_array[li] = time.mktime(temp)
+        u_secs[li] = time.mktime(temp)
+
+    t_array = u_secs[inverse]
 
     return len(t_array) == 1 and t_array[0].astype(object) or t_array
 
@@ -1,4 +1,3 @@
-import datetime
 import os
 
 import numpy as np
@@ -118,23 +117,29 @@ class Timeseries(object):
         Also, make the resolution to minutes as opposed to seconds
         todo: update exceptions to logged errors
         '''
-        # check to make sure the time values are in ascending order
-        if np.any(timeseries['time'][np.argsort(timeseries['time'])]
-                  != timeseries['time']):
-            raise ValueError('timeseries are not in ascending order. '
-                             'The datetime values in the array must be in '
-                             'ascending order')
-
-        # check for duplicate entries
-        unique = np.unique(timeseries['time'])
-        if len(unique) != len(timeseries['time']):
-            raise ValueError('timeseries must contain unique time entries. '
-                             'Number of duplicate entries: '
-                             '{0}'.format(len(timeseries) - len(unique)))
+        # a single entry, like a constant wind, is always in order and unique
+        if len(timeseries) > 1:
+            # a single pass over the time differences checks both that the
+            # time values are in ascending order and that there are no
+            # duplicates
+            diff = np.diff(timeseries['time'])
+            zero = np.timedelta64(0)
+
+            if np.any(diff < zero):
+                raise ValueError('timeseries are not in ascending order. '
+                                 'The datetime values in the array must be '
+                                 'in ascending order. First out of order '
+                                 'entry: {0}'
+                                 .format(np.argmax(diff < zero) + 1))
+
+            num_dups = np.count_nonzero(diff == zero)
+            if num_dups > 0:
+                raise ValueError('timeseries must contain unique time '
+                                 'entries. Number of duplicate entries: '
+                                 '{0}'.format(num_dups))
 
         # make resolution to minutes in datetime
-        for ix, tm in enumerate(timeseries['time'].astype(datetime.datetime)):
-            timeseries['time'][ix] = tm.replace(second=0)
+        timeseries['time'] = timeseries['time'].astype('datetime64[m]')
 
     def __str__(self):
         return '{0.__module__}.{0.__class__.__name__}'.format(self)
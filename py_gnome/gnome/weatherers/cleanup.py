@@ -65,6 +65,10 @@ class Skimmer(Weatherer, Serializable):
         # resolution; however, in this case we want numbers to add up correctly
         self._timestep = 0.0
 
+        # substance being skimmed for forecast/uncertain SpillContainer, keyed
+        # by sc.uncertain - set in prepare_for_model_run
+        self._substance = {}
+
         if self.units is None:
             raise TypeError('Need valid mass or volume units for amount')
 
@@ -91,6 +95,20 @@ class Skimmer(Weatherer, Serializable):
     def prepare_for_model_run(self, sc):
         if sc.spills:
             sc.weathering_data['skimmed'] = 0.0
+            # substance doesn't change during the run so look it up once
+            self._substance[sc.uncertain] = self._get_substance(sc)
+
+    def _get_substance(self, sc):
+        '''
+        return the substance to skim - only one substance is supported
+        '''
+        substance = sc.get_substances(complete=False)
+        if len(substance) > 1:
+            msg = ('Found more than one type of Oil - not supported. '
+                   'Results will be incorrect')
+            self.logger.error(msg)
+
+        return substance[0]
 
     def prepare_for_model_step(self, sc, time_step, model_time_datetime):
         '''
@@ -108,47 +126,47 @@ class Skimmer(Weatherer, Serializable):
             self._active = False
             return
 
-        self._timestep = time_step
-        dt = timedelta(seconds=time_step)
-
-        if (model_time_datetime + dt > self.active_start and
-            self.active_stop > model_time_datetime):
-            self._active = True
-
-            if (model_time_datetime < self.active_start):
-                self._timestep = \
-                    time_step - (self.active_start -
-                                 model_time_datetime).total_seconds()
-
-            if (self.active_stop < model_time_datetime + dt):
-                self._timestep = (self.active_stop -
-                                  model_time_datetime).total_seconds()
-
-            if (sc['status_codes'] == oil_status.skim).sum() == 0:
-                'Need to mark LEs for skimming'
-                substance = sc.get_substances(complete=False)
-                if len(substance) > 1:
-                    msg = ('Found more than one type of Oil - not supported. '
-                           'Results will be incorrect')
-                    self.logger.error(msg)
-                substance = substance[0]
-                total_mass_removed = self._get_mass(substance, self.amount)
-                total_mass_removed *= self.efficiency
-                data = sc.substancedata(substance, ['status_codes', 'mass'])
-
-                if total_mass_removed >= data['mass'].sum():
-                    data['status_codes'][:] = oil_status.skim
-                else:
-                    # sum up mass until threshold is reached, find index where
-                    # total_mass_removed is reached or exceeded
-                    ix = np.where(np.cumsum(data['mass']) >=
-                                  total_mass_removed)[0][0] + 1
-                    data['status_codes'][:ix] = oil_status.skim
-
-                sc.update_from_substancedata(self._arrays, substance)
+        step_end = model_time_datetime + timedelta(seconds=time_step)
 
-        else:
+        if (step_end <= self.active_start or
+                self.active_stop <= model_time_datetime):
+            # not active during this step - the common case so check it first
             self._active = False
+            return
+
+        self._active = True
+
+        # only use the part of the step for which the skimmer is active
+        if (self.active_stop < step_end):
+            self._timestep = (self.active_stop -
+                              model_time_datetime).total_seconds()
+        elif (model_time_datetime < self.active_start):
+            self._timestep = (step_end - self.active_start).total_seconds()
+        else:
+            self._timestep = time_step
+
+        if not np.any(sc['status_codes'] == oil_status.skim):
+            'Need to mark LEs for skimming'
+            substance = self._substance.get(sc.uncertain)
+            if substance is None:
+                substance = self._get_substance(sc)
+                self._substance[sc.uncertain] = substance
+
+            total_mass_removed = self._get_mass(substance, self.amount)
+            total_mass_removed *= self.efficiency
+            data = sc.substancedata(substance, ['status_codes', 'mass'])
+
+            if total_mass_removed >= data['mass'].sum():
+                data['status_codes'].fill(oil_status.skim)
+            else:
+                # sum up mass until threshold is reached, find index where
+                # total_mass_removed is reached or exceeded. cumsum is
+                # sorted since mass is non-negative so do a binary search
+                ix = np.searchsorted(np.cumsum(data['mass']),
+                                     total_mass_removed) + 1
+                data['status_codes'][:ix] = oil_status.skim
+
+            sc.update_from_substancedata(self._arrays, substance)
 
     def _get_mass(self, substance, amount):
         '''
@@ -177,10 +195,7 @@ class Skimmer(Weatherer, Serializable):
         Assumes there is only ever 1 substance being modeled!
         remove mass equally from LEs marked to be skimmed
         '''
-        if not self.active:
-            return
-
-        if len(sc) == 0:
+        if not self.active or len(sc) == 0:
             return
 
         for substance, data in sc.itersubstancedata(self._arrays):
@@ -191,17 +206,60 @@ class Skimmer(Weatherer, Serializable):
 
             # following should work even if all elements go to zero so
             # ~c_to_zero is all False since rm_mass_per_c is a scalar
-            mask = data['status_codes'] == oil_status.skim
-            rm_mass_frac = rm_mass / data['mass'][mask].sum()
-            data['mass_components'][mask, :] = \
-                (1 - rm_mass_frac) * data['mass_components'][mask, :]
-            data['mass'][mask] = data['mass_components'][mask, :].sum(1)
+            # convert the mask to indices once - elements are compacted at
+            # the end of every step so these are only valid for this call
+            idx = np.flatnonzero(data['status_codes'] == oil_status.skim)
+            total_mass = data['mass'][idx].sum()
+
+            if rm_mass <= 0.0 or total_mass <= 0.0:
+                # nothing to skim this step
+                continue
+
+            if rm_mass >= total_mass:
+                # skim everything that is left - no need to scale
+                rm_mass = total_mass
+                data['mass_components'][idx] = 0.0
+                data['mass'][idx] = 0.0
+            else:
+                rm_mass_frac = rm_mass / total_mass
+
+                # gather mass_components of skimmed LEs once, scale the copy
+                # in place and take the mass from the same copy
+                mass_components = data['mass_components'][idx]
+                mass_components *= (1 - rm_mass_frac)
+                data['mass_components'][idx] = mass_components
+                data['mass'][idx] = mass_components.sum(1)
 
             sc.weathering_data['skimmed'] += rm_mass
 
         sc.update_from_substancedata(self._arrays)
 
 
+def _remove_percent_mass(sc, arrays, pct, key):
+    '''
+    take out pct of the mass of LEs in water, spread equally over the mass
+    components, and add the mass removed to sc.weathering_data[key]
+
+    Used by Burn and Dispersion which only differ in pct and key
+    '''
+    # number of components is the same for all substances in sc
+    pct_per_le = (1 - pct/sc['mass_components'].shape[1])
+
+    for substance, data in sc.itersubstancedata(arrays):
+        mask = data['status_codes'] == oil_status.in_water
+
+        # gather mass_components once and scale the copy in place -
+        # mass removed is the difference of the sums before/after
+        mass_components = data['mass_components'][mask, :]
+        mass_before = mass_components.sum()
+        mass_components *= pct_per_le
+        sc.weathering_data[key] += mass_before - mass_components.sum()
+        data['mass_components'][mask, :] = mass_components
+        data['mass'][mask] = mass_components.sum(1)
+
+    sc.update_from_substancedata(arrays)
+
+
 class Burn(Weatherer, Serializable):
     _state = copy.deepcopy(Weatherer._state)
     _schema = WeathererSchema
@@ -212,18 +270,11 @@ class Burn(Weatherer, Serializable):
 
     def weather_elements(self, sc, time_step, model_time):
         'for now just take away 0.1% at every step'
-        if self.active and len(sc) > 0:
-            for substance, data in sc.itersubstancedata(self._arrays):
-                mask = data['status_codes'] == oil_status.in_water
-                # take out 0.25% of the mass
-                pct_per_le = (1 - 0.25/data['mass_components'].shape[1])
-                mass_remain = pct_per_le * data['mass_components'][mask, :]
-                sc.weathering_data['burned'] += \
-                    np.sum(data['mass_components'][mask, :] - mass_remain[:, :])
-                data['mass_components'][mask, :] = mass_remain
-                data['mass'][mask] = data['mass_components'][mask, :].sum(1)
+        if not self.active or len(sc) == 0:
+            return
 
-            sc.update_from_substancedata(self._arrays)
+        # take out 0.25% of the mass
+        _remove_percent_mass(sc, self._arrays, 0.25, 'burned')
 
 
 class Dispersion(Weatherer, Serializable):
@@ -236,15 +287,8 @@ class Dispersion(Weatherer, Serializable):
 
     def weather_elements(self, sc, time_step, model_time):
         'for now just take away 0.1% at every step'
-        if self.active and len(sc) > 0:
-            for substance, data in sc.itersubstancedata(self._arrays):
-                mask = data['status_codes'] == oil_status.in_water
-                # take out 0.25% of the mass
-                pct_per_le = (1 - 0.015/data['mass_components'].shape[1])
-                mass_remain = pct_per_le * data['mass_components'][mask, :]
-                sc.weathering_data['dispersed'] += \
-                    np.sum(data['mass_components'][mask, :] - mass_remain[:, :])
-                data['mass_components'][mask, :] = mass_remain
-                data['mass'][mask] = data['mass_components'][mask, :].sum(1)
-
-            sc.update_from_substancedata(self._arrays)
\ No newline at end of file
+        if not self.active or len(sc) == 0:
+            return
+
+        # take out 0.015% of the mass
+        _remove_percent_mass(sc, self._arrays, 0.015, 'dispersed')
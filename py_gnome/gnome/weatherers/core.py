@@ -136,7 +136,8 @@ class HalfLifeWeatherer(Weatherer):
             hl = self._halflife(data['mass_components'],
                                 self.half_lives, time_step)
             data['mass_components'][:] = hl
-            data['mass'][:] = data['mass_components'].sum(1)
+            # sum directly into the mass array - no temporary
+            data['mass_components'].sum(1, out=data['mass'])
 
         sc.update_from_substancedata(arrays)
         #sc['mass_components'][:] = hl
@@ -4,6 +4,8 @@ State is not persisted yet - we just have a default object that gets
 attached to Evaporation
 '''
 import os
+from weakref import WeakKeyDictionary
+
 import numpy as np
 
 from gnome.basic_types import oil_status
@@ -29,6 +31,21 @@ class FayGravityViscous(object):
         self.spreading_const = (1.53, 1.21)
         self.thickness_limit = .0001
 
+    @property
+    def spreading_const(self):
+        return self._spreading_const
+
+    @spreading_const.setter
+    def spreading_const(self, value):
+        '''
+        set (k1, k2) and the constants derived from them which are used by
+        init_area and update_area
+        '''
+        k1, k2 = value
+        self._spreading_const = (k1, k2)
+        self._init_area_const = np.pi*(k2**4/k1**2)
+        self._fay_const = k2**2./16.
+
     def init_area(self,
                   water_viscosity,
                   init_volume,
@@ -50,7 +67,7 @@ class FayGravityViscous(object):
         A0 = np.pi*(k2**4/k1**2)*(((n_LE*V0)**5*g*dbuoy)/(nu_h2o**2))**(1./6.)
         '''
         self._check_relative_bouyancy(relative_bouyancy)
-        out = (np.pi*(self.spreading_const[1]**4/self.spreading_const[0]**2)
+        out = (self._init_area_const
                * (((init_volume)**5*constants.gravity*relative_bouyancy) /
                   (water_viscosity**2))**(1./6.))
 
@@ -101,27 +118,50 @@ class FayGravityViscous(object):
             raise ValueError('for new particles use init_area - age '
                              'must be > 0')
 
+        # start from the current area - if out is None, copy area instead of
+        # allocating zeros and then overwriting them. Nothing to copy if the
+        # area is being updated in place
         if out is None:
-            out = np.zeros_like(init_volume, dtype=np.float64)
+            out = np.array(area, dtype=np.float64)
+        elif out is not area:
+            out[:] = area
 
         # ADIOS 2 used 0.1 mm as a minimum average spillet thickness for crude
         # oil and heavy refined products and 0.01 mm for lighter refined
         # products. Use 0.1mm for now
-        out[:] = area
-        mask = thickness > self.thickness_limit  # units of meters
-        if np.any(mask):
-            out[mask] = init_area[mask]
-            dFay = (self.spreading_const[1]**2./16. *
-                    (constants.gravity*relative_bouyancy[mask] *
-                     init_volume[mask]**2 /
-                     np.sqrt(water_viscosity*age[mask])))
-            dEddy = 0.033*age[mask]**(4./25)
-            out[mask] += (dFay + dEddy) * age[mask]
+        # find the indices once and use them for all the arrays instead of
+        # indexing every array with the boolean mask
+        idx = np.flatnonzero(thickness > self.thickness_limit)  # meters
+        if len(idx) > 0:
+            age_m = age[idx]
+
+            # Compute the new area in one buffer using in-place operations
+            # instead of creating a temporary array for every operation:
+            #   init_area + (dFay + dEddy) * age
+            # where
+            #   dFay = k2**2/16 * (g * dbuoy * V0**2 / sqrt(nu_h2o * age))
+            #   dEddy = 0.033 * age**(4/25)
+            tmp = age_m * water_viscosity
+            np.sqrt(tmp, out=tmp)
+
+            new_area = constants.gravity * relative_bouyancy[idx]
+            new_area *= init_volume[idx]**2
+            new_area /= tmp
+            new_area *= self._fay_const
+
+            np.power(age_m, 4./25, out=tmp)
+            tmp *= 0.033
+
+            new_area += tmp
+            new_area *= age_m
+            new_area += init_area[idx]
 
             # apply fraction coverage here so particles less than min thickness
             # are not changed
             if frac_coverage is not None:
-                out[mask] *= frac_coverage[mask]
+                new_area *= frac_coverage[idx]
+
+            out[idx] = new_area
 
         return out
 
@@ -157,10 +197,27 @@ class IntrinsicProps(AddLogger):
                             'frac_coverage': frac_coverage,
                             'thickness': thickness,
                             'age': age}
+
+        # arrays needed by _update_intrinsic_props and the ones it changes -
+        # only the changed arrays are copied back to the SpillContainer
+        self._arrays = tuple(self.array_types)
+        self._updated_arrays = ('density',
+                                'viscosity',
+                                'mass_components',
+                                'init_mass',
+                                'relative_bouyancy',
+                                'init_volume',
+                                'init_area',
+                                'area',
+                                'thickness')
         # following used to update viscosity
         self.visc_curvfit_param = 1.5e3     # units are sec^0.5 / m
         self.visc_f_ref = 0.84
 
+        # substance -> mass_fraction as a float64 ndarray so it isn't
+        # converted from a list every time new particles are released
+        self._mass_fraction = WeakKeyDictionary()
+
     def initialize(self, sc):
         '''
         1. initialize standard keys:
@@ -191,23 +248,25 @@ class IntrinsicProps(AddLogger):
         set these - will user be able to use select weatherers? Currently,
         evaporation defines 'density' data array
         '''
+        mass = sc['mass']
         mask = sc['status_codes'] == oil_status.in_water
+
         # update avg_density from density array
         # wasted cycles at present since all values in density for given
         # timestep should be the same, but that will likely change
         # todo: test weighted average
+        # mass weighted average as a dot product - no temporary arrays
+        mass_sum = mass.sum()
         sc.weathering_data['avg_density'] = \
-            np.sum(sc['mass']/np.sum(sc['mass']) * sc['density'])
+            np.dot(mass, sc['density']) / mass_sum
         sc.weathering_data['avg_viscosity'] = \
-            np.sum(sc['mass']/sc['mass'].sum() * sc['viscosity'])
-        sc.weathering_data['floating'] = sc['mass'][mask].sum()
+            np.dot(mass, sc['viscosity']) / mass_sum
+        sc.weathering_data['floating'] = mass[mask].sum()
 
         if new_LEs > 0:
-            amount_released = np.sum(sc['mass'][-new_LEs:])
-            if 'amount_released' in sc.weathering_data:
-                sc.weathering_data['amount_released'] += amount_released
-            else:
-                sc.weathering_data['amount_released'] = amount_released
+            sc.weathering_data['amount_released'] = \
+                (sc.weathering_data.get('amount_released', 0.0) +
+                 mass[-new_LEs:].sum())
 
     def _update_intrinsic_props(self, sc):
         '''
@@ -216,9 +275,13 @@ class IntrinsicProps(AddLogger):
         - update intrinsic properties like 'density', 'viscosity' and optional
         arrays for previously released particles
         '''
-        arrays = self.array_types.keys()
+        # water properties are the same for all substances so only look
+        # them up once
+        water_temp = self.water.get('temperature', 'K')
+        water_visc = self.water.get('kinematic_viscosity',
+                                    'square meter per second')
 
-        for substance, data in sc.itersubstancedata(arrays):
+        for substance, data in sc.itersubstancedata(self._arrays):
             'update properties only if elements are released'
             if len(data['density']) == 0:
                 continue
@@ -227,75 +290,114 @@ class IntrinsicProps(AddLogger):
             # we might end up changing 'age' to something with less than a
             # time_step resolution
             new_LEs_mask = data['density'] == 0
-            if sum(new_LEs_mask) > 0:
-                self._init_new_particles(new_LEs_mask, data, substance)
-            if sum(~new_LEs_mask) > 0:
-                self._update_old_particles(~new_LEs_mask, data, substance)
-
-        sc.update_from_substancedata(arrays)
 
-    def _init_new_particles(self, mask, data, substance):
+            # find indices of new/old LEs once - each is used to index many
+            # data arrays
+            new_LEs = np.flatnonzero(new_LEs_mask)
+            if len(new_LEs) > 0:
+                self._init_new_particles(new_LEs, data, substance,
+                                         water_temp, water_visc)
+            if len(new_LEs) < len(new_LEs_mask):
+                self._update_old_particles(np.flatnonzero(~new_LEs_mask),
+                                           data, substance,
+                                           water_temp, water_visc)
+
+        sc.update_from_substancedata(self._updated_arrays)
+
+    def _init_new_particles(self, idx, data, substance,
+                            water_temp, water_visc):
         '''
         initialize new particles released together in a given timestep
 
-        :param mask: mask gives only the new LEs in data arrays
-        :type mask: numpy bool array
+        :param idx: indices of only the new LEs in data arrays
+        :type idx: numpy int array
         :param data: dict containing numpy arrays
         :param substance: OilProps object defining the substance spilled
+        :param water_temp: water temperature in 'K'
+        :param water_visc: water kinematic viscosity in
+            'square meter per second'
         '''
-        water_temp = self.water.get('temperature', 'K')
-        data['density'][mask] = substance.get_density(water_temp)
+        # all new LEs of a substance have the same density
+        oil_density = substance.get_density(water_temp)
+        data['density'][idx] = oil_density
 
         # initialize mass_components - assume 'mass' is correctly set
-        data['mass_components'][mask, :len(substance.mass_fraction)] = \
-            (np.asarray(substance.mass_fraction, dtype=np.float64) *
-             (data['mass'][mask].reshape(len(data['mass'][mask]), -1)))
-
-        data['init_mass'][mask] = data['mass'][mask]
-
-        if substance.get_viscosity(water_temp) is not None:
+        mass_fraction = self._get_mass_fraction(substance)
+        mass = data['mass'][idx]
+        if idx[-1] - idx[0] + 1 == len(idx):
+            # new LEs are appended so they are usually a contiguous block -
+            # multiply directly into a view of mass_components
+            np.multiply(mass[:, np.newaxis], mass_fraction,
+                        out=data['mass_components'][idx[0]:idx[-1] + 1,
+                                                    :len(mass_fraction)])
+        else:
+            data['mass_components'][idx, :len(mass_fraction)] = \
+                mass_fraction * mass[:, np.newaxis]
+
+        data['init_mass'][idx] = mass
+
+        oil_visc = substance.get_viscosity(water_temp)
+        if oil_visc is not None:
             'make sure we do not add NaN values'
-            data['viscosity'][mask] = \
-                substance.get_viscosity(water_temp)
+            data['viscosity'][idx] = oil_visc
 
         '''
         Sets relative_bouyancy, init_volume, init_area, thickness all of
         which are required when computing the 'area' of each LE
         '''
-        data['relative_bouyancy'][mask] = \
-            self._set_relative_bouyancy(data['density'][mask])
-
-        # Cannot change the init_area in place since the following:
-        #    sc['init_area'][-new_LEs:][in_spill]
-        # is an advanced indexing operation that makes a copy anyway
-        # Also, init_volume is same for all these new LEs so just provide
-        # a scalar value
-        data['init_volume'][mask] = np.sum(data['init_mass'][mask] /
-                                           data['density'][mask], 0)
-        data['init_area'][mask] = \
-            self.spreading.init_area(self.water.get('kinematic_viscosity',
-                                                    'square meter per second'),
-                                     data['init_volume'][mask][0],
-                                     data['relative_bouyancy'][mask][0])
-        data['area'][mask] = data['init_area'][mask]
-        data['thickness'][mask] = data['init_volume'][mask]/data['area'][mask]
-
-    def _update_old_particles(self, mask, data, substance):
+        # relative_bouyancy, init_volume, init_area, area and thickness are
+        # the same for all these new LEs so compute the scalar values and
+        # assign them to the LEs
+        rel_bouy = self._set_relative_bouyancy(oil_density)
+        data['relative_bouyancy'][idx] = rel_bouy
+
+        init_volume = mass.sum() / oil_density
+        data['init_volume'][idx] = init_volume
+
+        init_area = self.spreading.init_area(water_visc,
+                                             init_volume,
+                                             rel_bouy)
+        data['init_area'][idx] = init_area
+        data['area'][idx] = init_area
+        data['thickness'][idx] = init_volume / init_area
+
+    def _get_mass_fraction(self, substance):
+        'return mass_fraction of substance as a float64 ndarray'
+        mass_fraction = self._mass_fraction.get(substance)
+        if mass_fraction is None:
+            mass_fraction = np.asarray(substance.mass_fraction,
+                                       dtype=np.float64)
+            self._mass_fraction[substance] = mass_fraction
+
+        return mass_fraction
+
+    def _update_old_particles(self, idx, data, substance,
+                              water_temp, water_visc):
         '''
         update density, area
         '''
         # update density/viscosity/relative_bouyance/area for previously
         # released elements
 
-        # following implementation results in an extra array called
-        # fw_d_fref but easy to read
-        v0 = substance.get_viscosity(self.water.get('temperature', 'K'))
+        # viscosity is:
+        #    v0 * exp(v0 * C * frac_lost) * (1 + fw/(1.187 - fw))**2.49
+        # where fw = frac_water/visc_f_ref and C = visc_curvfit_param
+        # The gathered copies of frac_water and frac_lost are updated in place
+        # so only one more temporary array is created
+        v0 = substance.get_viscosity(water_temp)
         if v0 is not None:
-            fw_d_fref = data['frac_water'][mask]/self.visc_f_ref
-            data['viscosity'][mask] = \
-                (v0 * np.exp(v0 * self.visc_curvfit_param *
-                             data['frac_lost'][mask]) *
-                 (1 + (fw_d_fref/(1.187 - fw_d_fref)))**2.49)
+            fw_d_fref = data['frac_water'][idx]
+            fw_d_fref /= self.visc_f_ref
+            np.divide(fw_d_fref, 1.187 - fw_d_fref, out=fw_d_fref)
+            fw_d_fref += 1
+            fw_d_fref **= 2.49
+
+            visc = data['frac_lost'][idx]
+            visc *= v0 * self.visc_curvfit_param
+            np.exp(visc, out=visc)
+            visc *= v0
+            visc *= fw_d_fref
+            data['viscosity'][idx] = visc
 
         # todo: Need formulas to update density
         # prev_rel = sc.num_released-new_LEs
@@ -308,19 +410,24 @@ class IntrinsicProps(AddLogger):
         # thickness greater than some minimum thickness and the frac_coverage
         # is only applied to LEs whose area is updated. Elements below a min
         # thickness should not be updated
-        data['area'][mask] = \
-            self.spreading.update_area(self.water.get('kinematic_viscosity',
-                                                      'square meter per second'),
-                                       data['init_area'][mask],
-                                       data['init_volume'][mask],
-                                       data['relative_bouyancy'][mask],
-                                       data['age'][mask],
-                                       data['thickness'][mask],
-                                       data['area'][mask],
-                                       data['frac_coverage'][mask])
-
-        # update thickness per the new area
-        data['thickness'][mask] = data['init_volume'][mask]/data['area'][mask]
+        # area[idx] is already a copy so let update_area work in it
+        area = data['area'][idx]
+        self.spreading.update_area(water_visc,
+                                   data['init_area'][idx],
+                                   data['init_volume'][idx],
+                                   data['relative_bouyancy'][idx],
+                                   data['age'][idx],
+                                   data['thickness'][idx],
+                                   area,
+                                   data['frac_coverage'][idx],
+                                   out=area)
+        data['area'][idx] = area
+
+        # update thickness per the new area - divide the gathered copy of
+        # init_volume in place by the area computed above
+        thickness = data['init_volume'][idx]
+        thickness /= area
+        data['thickness'][idx] = thickness
 
     def _set_relative_bouyancy(self, rho_oil):
         '''
@@ -10,7 +10,7 @@ np = numpy
 
 import unit_conversion
 
-from gnome.basic_types import datetime_value_2d
+from gnome.basic_types import datetime_value_2d, ts_format
 from gnome.environment import Wind, constant_wind
 
 from ..conftest import testdata
@@ -73,6 +73,32 @@ def test_units():
     assert wm.units == new_units
 
 
+@pytest.mark.parametrize(('from_unit', 'to_unit'),
+                         [('meter per second', 'knots'),
+                          ('knots', 'meter per second'),
+                          ('m/s', 'mph')])
+def test_convert_units(from_unit, to_unit):
+    'cached velocity scale factors give the same result as unit_conversion'
+    data = np.array([[1.5, 2.0], [10.0, 3.0]])
+    expected = unit_conversion.convert('Velocity', from_unit, to_unit, data)
+
+    out = Wind()._convert_units(data.copy(), ts_format.uv, from_unit, to_unit)
+    assert np.allclose(out, expected, atol=1e-10)
+
+
+def test_convert_units_in_place():
+    'unit conversion scales the data in place instead of copying it'
+    wind = Wind()
+    data = np.array([[1.5, 2.0], [10.0, 3.0]])
+    expected = unit_conversion.convert('Velocity', 'm/s', 'knots', data)
+
+    assert wind._convert_units(data, ts_format.uv, 'knots', 'knots') is data
+
+    out = wind._convert_units(data, ts_format.uv, 'm/s', 'knots')
+    assert out is data
+    assert np.allclose(data, expected)
+
+
 def test_default_init():
     wind = Wind()
     assert wind.timeseries == np.zeros((1,), dtype=datetime_value_2d)
@@ -129,6 +155,15 @@ def test_get_value(wind_circ):
         assert all(np.isclose(rec['value'], val))
 
 
+def test_get_value_sequence(wind_circ):
+    'get_value(..) for a sequence of times returns one row per time'
+    wind = wind_circ['wind']
+    val = wind.get_value(wind_circ['rq']['time'])
+
+    assert val.shape == (len(wind_circ['rq']), 2)
+    assert np.allclose(wind_circ['rq']['value'], val)
+
+
 @pytest.fixture(scope='module')
 def wind_rand(rq_rand):
     """
@@ -747,6 +747,33 @@ def test_get_spill_mask():
     assert all(sc['spill_num'][sc.get_spill_mask(sp1)] == 1)
 
 
+def test_get_spill_mask_counts():
+    '''
+    release elements from two spills and check get_spill_mask() finds
+    exactly the elements released by each one
+    '''
+    sp0 = point_line_release_spill(5, start_position, release_time)
+    sp1 = point_line_release_spill(3, start_position,
+                                   release_time + timedelta(hours=1))
+
+    sc = SpillContainer()
+    sc.spills += [sp0, sp1]
+    sc.prepare_for_model_run(windage_at)
+
+    sc.release_elements(900, release_time)
+    assert np.count_nonzero(sc.get_spill_mask(sp0)) == 5
+    assert np.count_nonzero(sc.get_spill_mask(sp1)) == 0
+
+    sc.release_elements(900, release_time + timedelta(hours=1))
+    assert np.count_nonzero(sc.get_spill_mask(sp0)) == 5
+    assert np.count_nonzero(sc.get_spill_mask(sp1)) == 3
+    assert np.all(sc['spill_num'][sc.get_spill_mask(sp1)] == 1)
+
+    with raises(ValueError):
+        sc.get_spill_mask(point_line_release_spill(1, start_position,
+                                                   release_time))
+
+
 def test_eq_spill_container():
     """ test if two spill containers are equal """
 
@@ -927,6 +954,40 @@ def test_model_step_is_done():
     assert np.count_nonzero(sc['spill_num'] == 1) == num_elements - 4
 
 
+def test_append_data_arrays_grows_buffer():
+    '''
+    data arrays are views into buffers that grow as elements are released -
+    existing elements must be preserved when the buffer grows
+    '''
+    sc = SpillContainer()
+    sc._initial_capacity = 4
+    sc.spills += point_line_release_spill(num_elements, start_position,
+                                          release_time,
+                                          end_release_time=end_release_time)
+    sc.prepare_for_model_run(windage_at)
+
+    time_step = 900
+    model_time = release_time
+    while model_time < end_release_time:
+        sc.release_elements(time_step, model_time)
+        model_time += timedelta(seconds=time_step)
+
+    assert sc.num_released == num_elements
+    assert np.all(sc['id'] == range(num_elements))
+    assert np.all(sc['spill_num'] == 0)
+    for name in sc.data_arrays:
+        assert sc[name].base is sc._buffers[name]
+        assert len(sc[name]) == num_elements
+
+    # buffers are reused after a rewind
+    buffers = dict(sc._buffers)
+    sc.rewind()
+    sc.prepare_for_model_run(windage_at)
+    sc.release_elements(time_step, release_time)
+    for name in sc.data_arrays:
+        assert sc[name].base is buffers[name]
+
+
 def test_SpillContainer_add_array_types():
     '''
     Test an array_type is dynamically added/subtracted from SpillContainer if
@@ -1061,6 +1122,24 @@ class TestSpillContainerPairGetSetDel:
         assert scp[0] == sr
         assert scp[1] == self.s0[1]
 
+    @pytest.mark.parametrize("uncertain", [False, True])
+    def test_index(self, uncertain):
+        scp = SpillContainerPair(uncertain)
+        for s in self.s0:
+            scp += s
+
+        for ix, s in enumerate(self.s0):
+            assert scp.index(s) == ix
+            assert scp.index(s.id) == ix
+
+        if uncertain:
+            for ix, u_spill in enumerate(scp._u_spill_container.spills):
+                assert scp.index(u_spill) == ix
+                assert scp.index(u_spill.id) == ix
+
+        with raises(ValueError):
+            scp.index(point_line_release_spill(1, (0, 0, 0), datetime.now()))
+
 
 class TestSubstanceSpillsDataStructure():
     '''
@@ -1158,6 +1237,9 @@ class TestSubstanceSpillsDataStructure():
         assert (len(sc.get_substances()) == 2 and
                 len(sc.iterspillsbysubstance()) == 2)
 
+        # each substance has its own data dict
+        assert sc._substances_spills.data[0] is not sc._substances_spills.data[1]
+
     def test_spills_different_substance_release(self):
         '''
         Test data structure gets correctly set/updated after release_elements
@@ -1203,6 +1285,34 @@ class TestSubstanceSpillsDataStructure():
                     assert array in data
                     assert np.all(data[array] == sc[array][mask])
 
+    def test_substance_index(self):
+        '''
+        indices of elements for each substance are kept up to date as
+        elements are released and removed
+        '''
+        sc = SpillContainer()
+        rel_time = datetime(2014, 1, 1, 12, 0, 0)
+        sc.spills += [point_line_release_spill(10, (1, 1, 1), rel_time,
+                                               element_type=floating(substance='ALAMO')),
+                      point_line_release_spill(10, (0, 0, 0), rel_time,
+                                               element_type=floating(substance=None)),
+                      point_line_release_spill(10, (2, 2, 2),
+                                               rel_time + timedelta(hours=1),
+                                               element_type=floating(substance='ALAMO'))]
+        sc.prepare_for_model_run()
+
+        sc.release_elements(900, rel_time)
+        for ix in range(len(sc.get_substances())):
+            assert np.all(sc._substance_index(ix) ==
+                          np.flatnonzero(sc['substance'] == ix))
+
+        sc['status_codes'][3:12] = oil_status.to_be_removed
+        sc.model_step_is_done()
+        sc.release_elements(900, rel_time + timedelta(hours=1))
+        for ix in range(len(sc.get_substances())):
+            assert np.all(sc._substance_index(ix) ==
+                          np.flatnonzero(sc['substance'] == ix))
+
 
 if __name__ == '__main__':
     test_rewind()
@@ -69,3 +69,17 @@ def test_time_dst():
     assert np.all(x == xn)
 
 
+def test_repeated_dates():
+    """
+    arrays with repeated and unsorted dates convert element by element
+    """
+
+    x = np.array(['2013-03-21T23:10', '2013-02-21T23:10', '2013-03-21T23:10',
+                  '2013-01-01T00:00'], dtype='datetime64[s]')
+    y = time_utils.date_to_sec(x)
+
+    assert len(y) == len(x)
+    for xi, yi in zip(x, y):
+        assert yi == time_utils.date_to_sec(xi)
+
+    assert np.all(time_utils.sec_to_date(y) == x)
@@ -623,6 +623,16 @@ class ModelManager(object):
 
         return self.running_models.get(model_id)
 
+    def find(self, model_id):
+        """
+        Return a model if one exists in `running_models` with the ID
+        ``model_id``, else None.
+
+        Like :meth:`get`, but a missing model is a normal result rather than
+        an exception.
+        """
+        return self.running_models.get(str(model_id), None)
+
     def delete(self, model_id):
         """
         Delete the model whose ID matches ``model_id``.
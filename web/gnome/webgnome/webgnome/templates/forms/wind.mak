@@ -7,8 +7,7 @@
             ${defs.form_control(h.text('name', data_value='wind.name'),
                 label='Name', inline=True)}
             <%
-               from webgnome.util import velocity_unit_values
-               velocity_unit_options = [(value, value) for value in velocity_unit_values]
+               from webgnome.util import velocity_unit_options
             %>
             ${defs.form_control(h.select('type', 'constant', (
                 ('constant-wind', 'Constant'),
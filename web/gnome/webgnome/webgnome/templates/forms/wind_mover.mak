@@ -34,8 +34,7 @@
                                     data_value='mover.wind_id'),
                                     label='Wind', inline=True)}
                                  <%
-                                   from webgnome.util import velocity_unit_values
-                                   velocity_unit_options = [(value, value) for value in velocity_unit_values]
+                                   from webgnome.util import velocity_unit_options
                                 %>
                                 ${defs.form_control(h.select('type', 'constant', (
                                     ('constant-wind', 'Constant'),
@@ -5,7 +5,6 @@ import sys
 import os
 import errno
 
-import inspect
 import posixpath
 import argparse
 import shutil
@@ -82,9 +81,17 @@ def json_date_adapter(obj, request):
     return encode_json_date(obj)
 
 
+def json_uuid_adapter(obj, request):
+    """
+    A custom JSON adapter for a Pyramid renderer that encodes a
+    :class:`uuid.UUID` as its string form, e.g. as used for model IDs.
+    """
+    return str(obj)
+
+
 gnome_json = JSON(adapters=((datetime.datetime, json_date_adapter),
                             (datetime.date, json_date_adapter),
-                            (uuid.UUID, lambda obj, request: str(obj)))
+                            (uuid.UUID, json_uuid_adapter))
                   )
 
 
@@ -92,6 +99,54 @@ def to_json(obj, encoder=json_encoder):
     return json.dumps(obj, default=encoder)
 
 
+def has_deferred(node):
+    """
+    Return True if Colander ``node`` or any of its children has a value that
+    is only resolved when the schema is bound.
+    """
+    for value in node.__dict__.values():
+        if isinstance(value, colander.deferred):
+            return True
+
+    return any(has_deferred(child) for child in node.children)
+
+
+# schema class -> bound schema, for schemas that have no deferred values
+_bound_schemas = {}
+
+
+def get_bound_schema(schema_cls):
+    """
+    Return a bound instance of ``schema_cls``.
+
+    Binding clones the whole schema tree, so bound schemas are reused for
+    schema classes without deferred values. Schemas with deferred values,
+    like a default of the current time, are bound every time.
+    """
+    try:
+        return _bound_schemas[schema_cls]
+    except KeyError:
+        schema = schema_cls()
+        bound = schema.bind()
+
+        if not has_deferred(schema):
+            _bound_schemas[schema_cls] = bound
+
+        return bound
+
+
+def get_value_getter(target):
+    """
+    Return a function that looks up a name on ``target``, as a key if
+    ``target`` is a dict and as an attribute otherwise. Missing names are
+    returned as None.
+    """
+    if isinstance(target, dict):
+        return target.get
+
+    return lambda name: getattr(target, name, None)
+
+
 class SchemaForm(object):
     """
     A class that creates fields on itself based on a Colander schema.
@@ -105,8 +160,8 @@ class SchemaForm(object):
     """
     class ObjectValue(object):
         def __init__(self, fields):
-            for field in fields:
-                self.__dict__[field[0]] = field[1]
+            for name, value in fields:
+                setattr(self, name, value)
 
         def __repr__(self):
             return ('ObjectValue('
@@ -116,17 +171,11 @@ class SchemaForm(object):
                     )
 
     def __init__(self, schema, obj=None):
-        self.schema = schema().bind()
+        self.schema = get_bound_schema(schema)
         self.obj = obj
         self._fields = {}
         self.create_fields()
 
-    def __getattr__(self, name):
-        if name in self._fields:
-            return self._fields[name]
-        else:
-            raise AttributeError(name)
-
     def __get__(self, name):
         return self._fields[name]
 
@@ -160,11 +209,14 @@ class SchemaForm(object):
         Otherwise, or if the value was not found on ``target``, use the field's
         default value if provided, falling back to None.
         """
-        if isinstance(target, dict):
-            value = target.get(field.name, None)
-        else:
-            value = getattr(target, field.name, None)
+        return self.serialize_field_value(field,
+                                          get_value_getter(target)(field.name))
 
+    def serialize_field_value(self, field, value):
+        """
+        Return the serialized ``value`` for Colander field object ``field``,
+        using the field's default if ``value`` is None.
+        """
         if value is None:
             value = self.get_default_field_value(field)
         else:
@@ -184,9 +236,23 @@ class SchemaForm(object):
         in a dict-like object.
 
         If ``obj`` was not given, look up field defaults.
+
+        Fields are set as plain attributes so lookups from templates don't go
+        through a Python-level ``__getattr__``. A field whose name is already
+        an attribute or method of the form is only kept in ``_fields``.
         """
+        # the target is the same for every field, so decide how to look up
+        # values on it once
+        get_value = get_value_getter(self.obj)
+
         for field in self.schema.children:
-            self._fields[field.name] = self.get_field_value(field, self.obj)
+            value = self.serialize_field_value(field, get_value(field.name))
+            self._fields[field.name] = value
+
+            # never let a field hide an attribute or method of the form
+            if (field.name not in self.__dict__ and
+                    not hasattr(type(self), field.name)):
+                setattr(self, field.name, value)
 
 
 def get_model_from_session(request):
@@ -197,12 +263,11 @@ def get_model_from_session(request):
     settings = request.registry.settings
     model_id = request.session.get(settings.model_session_key, None)
 
-    try:
-        model = settings.Model.get(model_id)
-    except settings.Model.DoesNotExist:
-        model = None
+    if not model_id:
+        # new visitor - no session key to look up
+        return None
 
-    return model
+    return settings.Model.find(model_id)
 
 
 MISSING_MODEL_ERROR = {
@@ -218,13 +283,17 @@ def valid_model_id(request):
     """
     model = None
     model_id = request.matchdict.get('model_id', None)
-    Model = request.registry.settings.Model
+
+    # an earlier validator in the chain already found and checked the model
+    validated_model = request.validated.get('model', None)
+    if (model_id and validated_model is not None and
+            validated_model.id == model_id):
+        return
+
+    settings = request.registry.settings
 
     if model_id:
-        try:
-            model = Model.get(model_id)
-        except Model.DoesNotExist:
-            model = None
+        model = settings.Model.find(model_id)
 
     if model is None:
         request.errors.add('body', 'model', 'Model not found.')
@@ -232,7 +301,7 @@ def valid_model_id(request):
         return
 
     authenticated_model_id = request.session.get(
-        request.registry.settings['model_session_key'], None)
+        settings['model_session_key'], None)
 
     if model.id != authenticated_model_id:
         raise Forbidden()
@@ -450,7 +519,6 @@ def valid_uploaded_file(request):
 
     abs_filename = os.path.join(model.static_data_dir, filename)
     relative_filename = os.path.join('data', filename)
-    print abs_filename
 
     if not os.path.exists(abs_filename):
         return die('File does not exist.')
@@ -479,7 +547,8 @@ def valid_environment_id(request):
 def valid_mover_id(request):
     """
     A Cornice validator that returns a 404 if a valid mover was not found using
-    an ``id`` matchdict value.
+    an ``id`` matchdict value. Once validated, the mover is added to the
+    `request.validated` dictionary as 'mover'; views must pop() it.
     """
     valid_model_id(request)
 
@@ -488,7 +557,9 @@ def valid_mover_id(request):
 
     model = request.validated['model']
 
-    if not request.matchdict['id'] in model.movers:
+    try:
+        request.validated['mover'] = model.movers[request.matchdict['id']]
+    except KeyError:
         request.errors.add('body', 'mover', 'Mover not found.')
         request.errors.status = 404
 
@@ -496,7 +567,8 @@ def valid_mover_id(request):
 def valid_spill_id(request):
     """
     A Cornice validator that returns a 404 if a valid spill was not found using
-    an ``id`` matchdict value.
+    an ``id`` matchdict value. Once validated, the spill is added to the
+    `request.validated` dictionary as 'spill'; views must pop() it.
     """
     valid_model_id(request)
 
@@ -505,7 +577,7 @@ def valid_spill_id(request):
 
     model = request.validated['model']
     try:
-        model.spills[request.matchdict['id']]
+        request.validated['spill'] = model.spills[request.matchdict['id']]
     except KeyError:
         request.errors.add('body', 'spill', 'Spill not found.')
         request.errors.status = 404
@@ -540,24 +612,22 @@ def require_model(f):
     method decorator if the first argument to the function is `self`.
     Otherwise, it returns a function decorator.
     """
-    args = inspect.getargspec(f)
+    code = f.__code__
 
-    if args and args.args[0] == 'self':
+    if code.co_argcount > 0 and code.co_varnames[0] == 'self':
         @wraps(f)
         def inner_method(self, *args, **kwargs):
             model = get_model_from_session(self.request)
-            settings = self.request.registry.settings
             if model is None:
-                model = settings.Model.create()
+                model = self.request.registry.settings.Model.create()
             return f(self, model, *args, **kwargs)
         wrapper = inner_method
     else:
         @wraps(f)
         def inner_fn(request, *args, **kwargs):
             model = get_model_from_session(request)
-            settings = request.registry.settings
             if model is None:
-                model = settings.Model.create()
+                model = request.registry.settings.Model.create()
             return f(request, model, *args, **kwargs)
         wrapper = inner_fn
     return wrapper
@@ -568,7 +638,7 @@ def get_obj_class(obj):
 
 
 class DirectionConverter(object):
-    DIRECTIONS = ['N',
+    DIRECTIONS = ('N',
                   'NNE',
                   'NE',
                   'ENE',
@@ -583,25 +653,27 @@ class DirectionConverter(object):
                   'W',
                   'WNW',
                   'NW',
-                  'NNW']
+                  'NNW')
     degrees_in_cardinal = 360.0 / len(DIRECTIONS)
     offset = (degrees_in_cardinal / 2)
 
+    # cardinal direction name -> index in DIRECTIONS
+    _direction_index = dict(zip(DIRECTIONS, range(len(DIRECTIONS))))
+
     @classmethod
     def to_one_rotation(cls, degree):
         return degree % 360
 
     @classmethod
     def is_cardinal_direction(cls, direction):
-        return direction in cls.DIRECTIONS
+        return direction in cls._direction_index
 
     @classmethod
     def get_cardinal_name(cls, degree):
         """
         Convert an integer degree into a cardinal direction name.
         """
-        idx = (int((cls.to_one_rotation(degree) + cls.offset)
-                   / cls.degrees_in_cardinal)
+        idx = (int((degree % 360 + cls.offset) / cls.degrees_in_cardinal)
                % len(cls.DIRECTIONS))
 
         return cls.DIRECTIONS[idx]
@@ -611,7 +683,12 @@ class DirectionConverter(object):
         """
        Convert a cardinal direction name into an integer degree.
        """
-        idx = cls.DIRECTIONS.index(cardinal_direction.upper())
+        try:
+            idx = cls._direction_index[cardinal_direction.upper()]
+        except KeyError:
+            raise ValueError('{0} is not a cardinal direction'
+                             .format(cardinal_direction))
+
         return cls.degrees_in_cardinal * idx
 
 
@@ -633,14 +710,13 @@ def get_filename_safe_time(_datetime=None):
     Return the current time as a string to be used as part of the file path
     for all images generated during a model run.
     """
-    format_str = "%Y-%m-%d-%H-%M-%S"
-
     if _datetime:
-        safe_time = time.strftime(format_str, _datetime.timetuple())
+        time_tuple = _datetime.timetuple()
     else:
-        safe_time = time.strftime(format_str)
+        time_tuple = time.localtime()
 
-    return safe_time
+    # same as strftime("%Y-%m-%d-%H-%M-%S") without parsing a format string
+    return '%04d-%02d-%02d-%02d-%02d-%02d' % tuple(time_tuple[:6])
 
 
 def delete_keys_from_dict(target_dict, keys):
@@ -673,6 +749,10 @@ def mkdir_p(path):
 
     http://stackoverflow.com/questions/600268/mkdir-p-functionality-in-python
     """
+    if os.path.isdir(path):
+        # common case - nothing to create, skip raising and catching OSError
+        return
+
     try:
         os.makedirs(path)
     except OSError as exc:
@@ -729,8 +809,10 @@ def monkey_patch_colander():
     setattr(colander.MappingSchema, 'serialize', patched_mapping_serialization)
 
 
-velocity_unit_values = list(chain.from_iterable(
-    [item[1] for item in ConvertDataUnits['Velocity'].values()]))
+# built once at import - the form templates use these on every render
+velocity_unit_values = tuple(chain.from_iterable(
+    item[1] for item in ConvertDataUnits['Velocity'].values()))
+velocity_unit_options = tuple((value, value) for value in velocity_unit_values)
 
 
 class CleanDirectoryCommand(object):
@@ -828,6 +910,11 @@ def create_location_file(path, **data):
     return json_config
 
 
+# path separators other than '/' that safe_join rejects in a filename
+_os_alt_seps = tuple(sep for sep in (os.path.sep, os.path.altsep)
+                     if sep not in (None, '/'))
+
+
 def safe_join(directory, filename):
     """
     Safely join `directory` and `filename`.  If this cannot be done,
@@ -839,8 +926,6 @@ def safe_join(directory, filename):
     :copyright: (c) 2011 by the Werkzeug Team, see AUTHORS for more details.
     :license: BSD, see LICENSE for more details.
     """
-    _os_alt_seps = list(sep for sep in [os.path.sep, os.path.altsep]
-                        if sep not in (None, '/'))
     filename = posixpath.normpath(filename)
 
     for sep in _os_alt_seps:
@@ -9,12 +9,29 @@ from webgnome import schema
 from webgnome import util
 
 
+# schema class -> JSON of its default values
+_default_schema_json_cache = {}
+
+
 def _default_schema_json(schema_cls):
     """
     Return a JSON object that contains default values for ``schema_cls``.
+
+    The JSON is created once per schema class instead of building and
+    binding the schema on every page load. Schemas with deferred values,
+    like a default of the current time, are serialized every time.
     """
-    return json.dumps(schema_cls().bind().serialize(),
-                      default=util.json_encoder)
+    try:
+        return _default_schema_json_cache[schema_cls]
+    except KeyError:
+        default_schema = schema_cls()
+        default_json = json.dumps(default_schema.bind().serialize(),
+                                  default=util.json_encoder)
+
+        if not util.has_deferred(default_schema):
+            _default_schema_json_cache[schema_cls] = default_json
+
+        return default_json
 
 
 @view_config(route_name='show_model', renderer='model.mak')
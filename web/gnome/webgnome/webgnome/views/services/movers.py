@@ -48,8 +48,7 @@ class WindMover(BaseResource):
         Return a JSON representation of the :class:`model_manager.WebWindMover`
         whose ID matches the ``id`` matchdict value.
         """
-        model = self.request.validated.pop('model')
-        mover = model.movers.get(self.id)
+        mover = self.request.validated.pop('mover')
         mover_data = mover.to_dict('create')
 
         return schema.WindMoverSchema().bind().serialize(mover_data)
@@ -62,8 +61,8 @@ class WindMover(BaseResource):
         representation.
         """
         data = self.request.validated
-        model = data.pop('model')
-        mover = model.movers.get(self.id)
+        data.pop('model')
+        mover = data.pop('mover')
         wind = data.pop('wind')
         mover.from_dict(data)
         mover.wind = wind
@@ -116,8 +115,7 @@ class RandomMover(BaseResource):
         Return a JSON representation of :class:`model_manager.WebRandomMover`
         matching the ``id`` matchdict value.
         """
-        model = self.request.validated.pop('model')
-        mover = model.movers.get(self.id)
+        mover = self.request.validated.pop('mover')
         mover_data = mover.to_dict('create')
 
         return schema.RandomMoverSchema().bind().serialize(mover_data)
@@ -129,8 +127,8 @@ class RandomMover(BaseResource):
         representation.
         """
         data = self.request.validated
-        model = data.pop('model')
-        mover = model.movers.get(self.id)
+        data.pop('model')
+        mover = data.pop('mover')
         mover.from_dict(data)
 
         return RandomMoverSchema().bind().serialize(mover.to_dict())
@@ -47,7 +47,7 @@ class PointSourceRelease(BaseResource):
         Return a JSON representation of the PointSourceRelease matching the
         ``id`` matchdict value.
         """
-        spill = self.request.validated['model'].spills[self.id]
+        spill = self.request.validated.pop('spill')
 
         return schema.PointSourceReleaseSchema().bind().serialize(
             spill.to_dict('create'))
@@ -60,7 +60,7 @@ class PointSourceRelease(BaseResource):
         """
         data = self.request.validated
         model = data.pop('model')
-        spill = model.spills[self.id]
+        spill = data.pop('spill')
         spill.from_dict(data)
 
         # XXX: The model will set ``end_position`` to the start position if